@@ -0,0 +1,269 @@
+"""
+# 贪吃蛇批量环境 - NumPy 向量化版本
+
+## 特点
+- 一次 `step()` 同时推进成千上万局独立的游戏，没有每局一个的 Python 对象
+- 规则与 snake_env.SnakeEnv（也就是 v5_oop.py 的 `Game.update`）完全相同，`verify()` 逐步对照检查
+- 结束的游戏自动重新开始，适合批量评估智能体
+
+## 数据结构
+每局游戏的格子用一维下标 y * width + x 表示，所有数组的第一维是游戏序号：
+- **环形缓冲区** `bodies`：每局一行，长度为格子总数；`head` 指向头部，
+  头部之后的 `length` 个元素（往回数）就是蛇身，移动时头部指针前进一格、尾部自然让出
+- **占据网格** `occupied`：每局一行布尔值，碰撞检测是一次花式索引
+- **方向** `direction`、**食物** `food`、**长度** `length`、**分数** `score`
+
+吃到食物后，新的食物从空闲格子中均匀地随机选择：对空闲格子求累加和，
+找到第 k 个空闲格子（k 是随机数），与 snake_env 的 FreeCells 分布相同。
+
+## 接口
+- `env = BatchSnakeEnv(n)` 创建 n 局游戏
+- `obs = env.reset(seed)` 全部重新开始，返回 (n, 9) 的观测，编码与 SnakeEnv.observe() 相同
+- `obs, reward, done, info = env.step(actions)` 每局前进一步，actions 是长度为 n 的 0-3 数组
+  - 结束的游戏在返回前已经重新开始，obs 是新一局的观测
+  - info 中的 'score'、'length'、'won' 是结束前的值
+
+## 运行方式
+    python batch_env.py --envs 4096 --steps 1000   # 用随机动作测量每秒的步数
+    python batch_env.py --verify                   # 与 snake_env.SnakeEnv 逐步对照
+"""
+
+# 导入必要的库
+# argparse: 用于解析命令行参数
+# time: 用于测量速度
+# numpy: 用于批量计算
+import argparse
+import time
+
+import numpy as np
+
+import snake_env
+from snake_env import GRID_WIDTH, GRID_HEIGHT, ACTIONS, RIGHT
+
+# 每个动作的移动方向
+DX = np.array([dx for dx, _ in ACTIONS], dtype=np.int32)
+DY = np.array([dy for _, dy in ACTIONS], dtype=np.int32)
+
+
+class BatchSnakeEnv:
+    """
+    批量贪吃蛇环境：同时运行 n 局独立的游戏
+    """
+    def __init__(self, n, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None):
+        """
+        初始化方法
+        参数：
+            n: 游戏局数
+            width, height: 网格的大小
+            seed: 随机数种子，决定食物的位置序列
+        """
+        self.n = n
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.rng = np.random.default_rng(seed)
+        self.index = np.arange(n)
+        self.bodies = np.zeros((n, self.cells), dtype=np.int32)  # 蛇身的环形缓冲区
+        self.occupied = np.zeros((n, self.cells), dtype=bool)  # 蛇身占据的格子
+        self.head = np.zeros(n, dtype=np.int64)  # 头部在环形缓冲区中的位置
+        self.length = np.zeros(n, dtype=np.int64)  # 蛇的长度
+        self.direction = np.zeros(n, dtype=np.int64)  # 当前方向（动作编号）
+        self.food = np.zeros(n, dtype=np.int64)  # 食物所在的格子
+        self.score = np.zeros(n, dtype=np.int64)  # 分数，每个食物10分
+        self.steps = np.zeros(n, dtype=np.int64)  # 本局已走的步数
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        全部重新开始
+        参数：
+            seed: 随机数种子；None 表示继续使用当前的随机数序列
+        返回：
+            (n, 9) 的观测
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.index)
+        return self.observe()
+
+    def reset_envs(self, envs):
+        """
+        让 envs 中的游戏重新开始：蛇在网格中央、长度为1、向右移动，重新生成食物
+        """
+        start = self.height // 2 * self.width + self.width // 2
+        self.occupied[envs] = False
+        self.occupied[envs, start] = True
+        self.head[envs] = 0
+        self.bodies[envs, 0] = start
+        self.length[envs] = 1
+        self.direction[envs] = RIGHT
+        self.score[envs] = 0
+        self.steps[envs] = 0
+        self.spawn_food(envs)
+
+    def spawn_food(self, envs):
+        """
+        在 envs 中的游戏里，从空闲格子中均匀地随机选择新的食物位置
+        返回：
+            没有空闲格子（蛇占满了整个网格）的游戏的布尔数组
+        """
+        free_count = self.cells - self.length[envs]
+        full = free_count == 0
+        # 第 k 个空闲格子就是累加和第一次超过 k 的位置
+        k = (self.rng.random(len(envs)) * free_count).astype(np.int64)
+        free = np.cumsum(~self.occupied[envs], axis=1)
+        self.food[envs] = np.where(full, 0, (free > k[:, None]).argmax(axis=1))
+        return full
+
+    def step(self, actions):
+        """
+        每局游戏前进一步，规则与 snake_env.SnakeEnv.step 相同
+        参数：
+            actions: 长度为 n 的整数数组，0 上、1 右、2 下、3 左；与当前方向相反的动作被忽略
+        返回：
+            (obs, reward, done, info)，结束的游戏已经重新开始
+        """
+        actions = np.asarray(actions)
+        index = self.index
+        # 不能直接掉头
+        self.direction = np.where(actions == (self.direction + 2) % 4, self.direction, actions)
+        self.steps += 1
+
+        # 计算新的头部位置
+        head = self.bodies[index, self.head]
+        x = head % self.width + DX[self.direction]
+        y = head // self.width + DY[self.direction]
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        new_head = np.where(wall, 0, y * self.width + x)
+
+        # 在移动之前检查碰撞（与整条蛇身比较，包括这一步会让出的尾部）
+        dead = wall | self.occupied[index, new_head]
+        alive = np.flatnonzero(~dead)
+        moved = new_head[alive]
+
+        # 移动：头部指针前进一格，写入新头部
+        self.head[alive] = (self.head[alive] + 1) % self.cells
+        self.bodies[alive, self.head[alive]] = moved
+        self.occupied[alive, moved] = True
+
+        # 检查是否吃到食物：吃到的变长，没吃到的让出尾部
+        eat = moved == self.food[alive]
+        eaters, movers = alive[eat], alive[~eat]
+        tail = self.bodies[movers, (self.head[movers] - self.length[movers]) % self.cells]
+        self.occupied[movers, tail] = False
+        self.length[eaters] += 1
+        self.score[eaters] += 10
+        won = np.zeros(self.n, dtype=bool)
+        if len(eaters):
+            won[eaters] = self.spawn_food(eaters)
+
+        reward = np.zeros(self.n, dtype=np.float32)
+        reward[eaters] = 1.0
+        reward[dead] = -1.0
+        done = dead | won
+        info = {'score': self.score.copy(), 'length': self.length.copy(), 'won': won}
+
+        # 结束的游戏自动重新开始
+        finished = np.flatnonzero(done)
+        if len(finished):
+            self.reset_envs(finished)
+        return self.observe(), reward, done, info
+
+    def blocked(self, x, y):
+        """
+        (x, y) 是墙外或蛇身，x、y 是长度为 n 的数组
+        """
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        return wall | self.occupied[self.index, np.where(wall, 0, y * self.width + x)]
+
+    def observe(self):
+        """
+        计算观测：(n, 9) 的整数数组，每行与 SnakeEnv.observe() 相同
+        (头部x, 头部y, 方向x, 方向y, 食物x, 食物y, 前方危险, 左侧危险, 右侧危险)
+        """
+        head = self.bodies[self.index, self.head]
+        x, y = head % self.width, head // self.width
+        dx, dy = DX[self.direction], DY[self.direction]
+        return np.stack([x, y, dx, dy, self.food % self.width, self.food // self.width,
+                         self.blocked(x + dx, y + dy),  # 前方
+                         self.blocked(x + dy, y - dx),  # 左侧（逆时针转90度）
+                         self.blocked(x - dy, y + dx)],  # 右侧（顺时针转90度）
+                        axis=1).astype(np.int64)
+
+    def positions(self, env):
+        """
+        第 env 局的蛇身，头部在前，与 SnakeEnv 的 snake.positions 顺序相同
+        返回：
+            (x, y) 元组的列表
+        """
+        ring = (self.head[env] - np.arange(self.length[env])) % self.cells
+        return [(int(cell) % self.width, int(cell) // self.width) for cell in self.bodies[env, ring]]
+
+
+def verify(n=64, steps=5000, width=GRID_WIDTH, height=GRID_HEIGHT, seed=0):
+    """
+    与 snake_env.SnakeEnv 逐步对照：n 局游戏走 steps 步，每一步比较观测、奖励、结束标志和蛇身
+    两种环境的随机数序列不同，SnakeEnv 的食物位置每次都同步成批量环境生成的位置
+    返回：
+        所有检查都一致时返回 True
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchSnakeEnv(n, width, height, seed)
+    envs = [snake_env.SnakeEnv(width, height) for _ in range(n)]
+
+    def sync_food(i):
+        food = int(batch.food[i])
+        envs[i].food.position = (food % width, food // width)
+
+    for i in range(n):
+        sync_food(i)
+    for _ in range(steps):
+        # 偏向保持方向，让蛇能活得更久、吃到更多食物
+        actions = np.where(rng.random(n) < 0.8, batch.direction, rng.integers(0, 4, n))
+        obs, reward, done, info = batch.step(actions)
+        for i in range(n):
+            _, expected_reward, expected_done, expected_info = envs[i].step(int(actions[i]))
+            if (expected_reward != reward[i] or expected_done != done[i] or
+                    expected_info['score'] != info['score'][i] or expected_info['won'] != info['won'][i]):
+                return False
+            if expected_done:
+                envs[i].reset()
+            elif list(envs[i].snake.positions) != batch.positions(i):
+                return False
+            if envs[i].food.position != tuple(obs[i, 4:6]):  # 吃到了食物或重新开始：同步新的食物
+                sync_food(i)
+            if envs[i].observe() != tuple(int(v) for v in obs[i]):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量贪吃蛇环境')
+    parser.add_argument('--envs', type=int, default=4096, help='同时运行的游戏局数')
+    parser.add_argument('--steps', type=int, default=1000, help='每局的步数')
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help='网格宽度')
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help='网格高度')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    parser.add_argument('--verify', action='store_true', help='与 snake_env.SnakeEnv 逐步对照')
+    args = parser.parse_args()
+
+    if args.verify:
+        ok = verify(width=args.width, height=args.height, seed=args.seed)
+        print('matches SnakeEnv' if ok else 'DOES NOT MATCH SnakeEnv')
+        return
+
+    env = BatchSnakeEnv(args.envs, args.width, args.height, args.seed)
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, 4, (64, args.envs))  # 预先生成随机动作，只测量环境本身
+    games = 0
+    start = time.perf_counter()
+    for i in range(args.steps):
+        _, _, done, _ = env.step(actions[i & 63])
+        games += int(done.sum())
+    elapsed = time.perf_counter() - start
+    total = args.envs * args.steps
+    print(f'{total} steps, {games} games in {elapsed:.2f}s: {total / elapsed:.0f} steps/s')
+
+
+if __name__ == '__main__':
+    main()
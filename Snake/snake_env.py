@@ -0,0 +1,332 @@
+"""
+# 贪吃蛇游戏环境 - 无窗口版本
+
+## 特点
+- 只包含游戏规则，不依赖 Pygame，不需要显示器
+- 提供 `reset(seed)` 和 `step(action)` 接口，方便智能体在屏幕外训练和评估
+- 规则与 v5_oop.py 的 `Game.update` 完全相同（v5 的 Game 就是用这个环境运行的）
+
+## 接口
+- `env = SnakeEnv()` 创建环境
+- `obs = env.reset(seed)` 开始新的一局，seed 相同时食物的位置序列相同
+- `obs, reward, done, info = env.step(action)` 前进一步
+  - action：0 上、1 右、2 下、3 左；None 表示保持当前方向；与当前方向相反的动作被忽略
+  - reward：吃到食物 +1，撞墙或撞到自己 -1，其余为 0
+  - done：游戏是否结束（撞到东西或蛇占满了整个网格）
+  - info：`{'score': 分数, 'length': 蛇的长度, 'won': 是否胜利}`
+- 观测是一个整数元组：(头部x, 头部y, 方向x, 方向y, 食物x, 食物y, 前方危险, 左侧危险, 右侧危险)，
+  计算只需要几次集合查找；需要整个网格时调用 `env.grid()`
+
+## 运行方式
+    python snake_env.py --steps 1000000   # 用随机动作测量每秒的步数
+"""
+
+# 导入必要的库
+# argparse: 用于解析命令行参数
+# random: 用于生成随机数
+# time: 用于测量速度
+# deque: 双端队列，两端添加和删除元素都很快
+import argparse
+import random
+import time
+from collections import deque
+
+# 游戏设置：与 v5_oop.py 的网格大小相同（800x600 像素的窗口，每格20像素）
+GRID_WIDTH = 40
+GRID_HEIGHT = 30
+
+# 动作对应的移动方向 (x, y)
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+ACTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# grid() 中每个格子的编码
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+
+class FreeCells:
+    """
+    空闲格子类：记录所有没有被蛇占据的格子，可以 O(1) 地添加、删除和随机选择
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        """
+        初始化方法：一开始所有格子都是空闲的
+        """
+        # 空闲格子的列表，随机选一个元素就是均匀地选一个空闲格子
+        self.cells = [(x, y) for y in range(height) for x in range(width)]
+        # 每个空闲格子在列表中的下标
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def remove(self, cell):
+        """
+        删除方法：格子被蛇占据
+        用列表的最后一个元素填补它的位置（交换删除），不需要移动其他元素
+        """
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.index[last] = i
+
+    def add(self, cell):
+        """
+        添加方法：蛇离开了这个格子
+        """
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng=random):
+        """
+        随机选择一个空闲格子
+        参数：
+            rng: 随机数生成器
+        返回：
+            (x, y)；没有空闲格子时返回 None
+        """
+        if not self.cells:
+            return None
+        return rng.choice(self.cells)
+
+
+class Snake:
+    """
+    蛇类：管理蛇的位置、移动和碰撞检测
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        """
+        初始化方法：创建蛇的初始状态
+        参数：
+            width, height: 网格的大小
+        """
+        self.width = width
+        self.height = height
+        self.reset()
+
+    def reset(self):
+        """
+        重置方法：将蛇恢复到初始状态（网格中央，向右移动）
+        """
+        # 蛇身用双端队列存储 (x, y) 元组，第一个元素是头部
+        self.positions = deque([(self.width//2, self.height//2)])
+        # 蛇身占据的格子集合，与 positions 保持一致
+        self.occupied = set(self.positions)
+        # 没有被蛇占据的格子，用于生成食物
+        self.free_cells = FreeCells(self.width, self.height)
+        self.free_cells.remove(self.positions[0])
+        self.direction = ACTIONS[RIGHT]  # 初始向右移动
+
+    def turn(self, action):
+        """
+        转向方法：按动作改变方向，不能直接掉头
+        参数：
+            action: 0 上、1 右、2 下、3 左
+        """
+        dx, dy = ACTIONS[action]
+        if (dx, dy) != (-self.direction[0], -self.direction[1]):
+            self.direction = (dx, dy)
+
+    def next_head(self):
+        """
+        计算按当前方向移动一格后的头部位置（不移动蛇）
+        返回：
+            新的头部位置 (x, y)
+        """
+        head = self.positions[0]
+        return (head[0] + self.direction[0], head[1] + self.direction[1])
+
+    def move(self, new_head):
+        """
+        移动方法：把新头部添加到蛇身的开头
+        参数：
+            new_head: 新的头部位置 (x, y)，由 next_head() 计算
+        """
+        self.positions.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free_cells.remove(new_head)
+
+    def grow(self):
+        """
+        生长方法：让蛇变长（不删除尾部）
+        """
+        pass  # 不删除尾部即可实现增长
+
+    def remove_tail(self):
+        """
+        删除尾部：没有吃到食物时调用，保持长度不变
+        """
+        tail = self.positions.pop()
+        self.occupied.remove(tail)
+        self.free_cells.add(tail)
+
+    def check_collision(self, new_head):
+        """
+        碰撞检测方法：检查是否发生碰撞
+        参数：
+            new_head: 新的头部位置 (x, y)
+        返回：
+            True: 撞墙或撞到自己
+            False: 未发生碰撞
+        """
+        x, y = new_head
+        return not (0 <= x < self.width and 0 <= y < self.height) or new_head in self.occupied
+
+
+class Food:
+    """
+    食物类：管理食物的位置
+    """
+    def __init__(self):
+        """
+        初始化方法：食物的位置由 generate() 设置
+        """
+        self.position = (0, 0)
+
+    def generate(self, free_cells, rng=random):
+        """
+        生成方法：从空闲格子中均匀地随机选择新的食物位置
+        参数：
+            free_cells: 没有被蛇占据的格子（FreeCells）
+            rng: 随机数生成器
+        返回：
+            True: 生成成功
+            False: 没有空闲格子（蛇占满了整个网格）
+        """
+        position = free_cells.choice(rng)
+        if position is None:
+            return False
+        self.position = position
+        return True
+
+
+class SnakeEnv:
+    """
+    贪吃蛇环境：reset() 开始新的一局，step(action) 前进一步
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None, snake=None, food=None):
+        """
+        初始化方法
+        参数：
+            width, height: 网格的大小
+            seed: 随机数种子，决定食物的位置序列
+            snake, food: 使用的蛇和食物对象（v5 传入可以绘制的子类），默认新建
+        """
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.snake = snake if snake is not None else Snake(width, height)
+        self.food = food if food is not None else Food()
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        开始新的一局
+        参数：
+            seed: 随机数种子；None 表示继续使用当前的随机数序列
+        返回：
+            初始观测
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.food.generate(self.snake.free_cells, self.rng)
+        self.score = 0  # 每吃到一个食物得10分，与 v5 相同
+        self.steps = 0
+        self.done = False
+        self.won = False  # 蛇占满整个网格时胜利
+        return self.observe()
+
+    def step(self, action=None):
+        """
+        前进一步，规则与 v5 的 Game.update 相同
+        参数：
+            action: 0 上、1 右、2 下、3 左；None 表示保持当前方向
+        返回：
+            (obs, reward, done, info)
+        """
+        if self.done:
+            raise RuntimeError('step() called after the game ended; call reset() first')
+        snake = self.snake
+        if action is not None:
+            snake.turn(action)
+        self.steps += 1
+
+        # 在移动之前检查碰撞
+        new_head = snake.next_head()
+        if snake.check_collision(new_head):
+            self.done = True
+            reward = -1.0
+        else:
+            snake.move(new_head)
+            # 检查是否吃到食物
+            if new_head == self.food.position:
+                self.score += 10
+                snake.grow()
+                reward = 1.0
+                # 没有空闲格子了：蛇占满了整个网格，游戏胜利
+                if not self.food.generate(snake.free_cells, self.rng):
+                    self.done = self.won = True
+            else:
+                snake.remove_tail()
+                reward = 0.0
+        return self.observe(), reward, self.done, {'score': self.score, 'length': len(snake.positions),
+                                                   'won': self.won}
+
+    def blocked(self, x, y):
+        """
+        (x, y) 是墙外或蛇身
+        """
+        return not (0 <= x < self.width and 0 <= y < self.height) or (x, y) in self.snake.occupied
+
+    def observe(self):
+        """
+        计算观测：(头部x, 头部y, 方向x, 方向y, 食物x, 食物y, 前方危险, 左侧危险, 右侧危险)
+        """
+        x, y = self.snake.positions[0]
+        dx, dy = self.snake.direction
+        fx, fy = self.food.position
+        blocked = self.blocked
+        return (x, y, dx, dy, fx, fy,
+                int(blocked(x + dx, y + dy)),  # 前方
+                int(blocked(x + dy, y - dx)),  # 左侧（逆时针转90度）
+                int(blocked(x - dy, y + dx)))  # 右侧（顺时针转90度）
+
+    def grid(self):
+        """
+        整个网格的编码：长度为 width*height 的 bytearray，按行存储
+        0 空、1 蛇身、2 头部、3 食物
+        """
+        cells = bytearray(self.width * self.height)
+        for x, y in self.snake.occupied:
+            cells[y * self.width + x] = BODY
+        x, y = self.snake.positions[0]
+        cells[y * self.width + x] = HEAD
+        if not self.won:
+            x, y = self.food.position
+            cells[y * self.width + x] = FOOD
+        return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量贪吃蛇环境的速度')
+    parser.add_argument('--steps', type=int, default=1000000, help='总步数')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    args = parser.parse_args()
+
+    env = SnakeEnv(seed=args.seed)
+    rng = random.Random(args.seed)
+    actions = [rng.randrange(4) for _ in range(4096)]  # 预先生成随机动作，只测量环境本身
+    games = 0
+    start = time.perf_counter()
+    for i in range(args.steps):
+        _, _, done, _ = env.step(actions[i & 4095])
+        if done:
+            games += 1
+            env.reset()
+    elapsed = time.perf_counter() - start
+    print(f'{args.steps} steps, {games} games in {elapsed:.2f}s: {args.steps / elapsed:.0f} steps/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,8 @@
 ### 1. 食物系统
 - **随机生成**：使用 `random` 模块生成随机位置
 - **碰撞避免**：确保食物不会生成在蛇身上
+- **空闲格子索引**：维护一个没有被蛇占据的格子列表，从中随机选一个就是食物的位置，
+  不需要反复试探随机位置；列表为空说明蛇占满了整个网格，游戏胜利
 - **食物获取**：吃到食物后蛇身变长，分数增加
 
 ### 2. 分数系统
@@ -32,6 +34,10 @@
   - 吃到食物：保留尾部，蛇身变长
   - 未吃到食物：删除尾部，保持长度不变
 - **位置更新**：根据移动方向更新蛇身位置
+- **数据结构**：
+  - 蛇身存放在双端队列 `collections.deque` 中，头部插入和尾部删除都是 O(1)
+  - 另用一个集合 `set` 记录蛇身占据的格子，检查“是否撞到自己”也是 O(1)
+  - 蛇再长，每一帧的更新时间都不变
 
 ## 游戏控制
 - 方向键：控制蛇的移动方向
@@ -42,15 +48,18 @@
 - 每吃到一个食物得10分
 - 撞墙或撞到自己身体游戏结束
 - 食物随机生成在空白位置
+- 蛇占满整个网格时胜利
 """
 
 # 导入必要的库
 # pygame: 用于创建游戏的Python库
 # sys: 提供与Python解释器和运行环境相关的变量和函数
 # random: 用于生成随机数
+# deque: 双端队列，两端添加和删除元素都很快
 import pygame
 import sys
 import random
+from collections import deque
 
 # 初始化 Pygame
 # pygame.init() 初始化所有Pygame模块，在使用Pygame功能前必须调用
@@ -89,37 +98,66 @@ pygame.font.init()
 # 创建字体对象，None表示使用默认字体，36是字体大小
 font = pygame.font.Font(None, 36)
 
-def generate_food(snake_pos):
+def make_free_cells():
     """
-    生成新的食物，确保不会生成在蛇身上
+    创建空闲格子索引：记录所有没有被蛇占据的格子
+    返回：
+        free_cells: 空闲格子的列表，随机选一个元素就是均匀地选一个空闲格子
+        free_index: 字典，记录每个空闲格子在 free_cells 中的下标
+    """
+    free_cells = [(x, y) for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)]
+    free_index = {cell: i for i, cell in enumerate(free_cells)}
+    return free_cells, free_index
+
+def take_cell(free_cells, free_index, cell):
+    """
+    蛇占据了一个格子：把它从空闲格子索引中删除
+    用列表的最后一个元素填补它的位置（交换删除），不需要移动其他元素，是 O(1)
+    """
+    i = free_index.pop(cell)
+    last = free_cells.pop()
+    if last != cell:
+        free_cells[i] = last
+        free_index[last] = i
+
+def release_cell(free_cells, free_index, cell):
+    """
+    蛇离开了一个格子：把它加回空闲格子索引
+    """
+    free_index[cell] = len(free_cells)
+    free_cells.append(cell)
+
+def generate_food(free_cells):
+    """
+    生成新的食物，从空闲格子中均匀地随机选一个，不会生成在蛇身上
     参数：
-        snake_pos: 蛇身体的位置列表
+        free_cells: 空闲格子的列表
     返回：
-        新的食物位置 [x, y]
+        新的食物位置 (x, y)；没有空闲格子（蛇占满了整个网格）时返回 None
     """
-    while True:
-        # random.randint(a, b) 生成a到b之间的随机整数（包含a和b）
-        food_pos = [
-            random.randint(0, GRID_WIDTH-1),  # 随机x坐标
-            random.randint(0, GRID_HEIGHT-1)  # 随机y坐标
-        ]
-        # 确保食物不会生成在蛇身上
-        if food_pos not in snake_pos:
-            return food_pos
+    if not free_cells:
+        return None
+    # random.choice() 从列表中随机选择一个元素
+    return random.choice(free_cells)
 
 def main():
     """
     主函数：实现完整的游戏机制
     """
     # 初始化蛇的位置和方向
-    # 使用列表存储蛇身体的每个部分的位置
-    # 每个位置是一个包含[x, y]坐标的列表
-    snake_pos = [[GRID_WIDTH//2, GRID_HEIGHT//2]]
+    # 使用双端队列存储蛇身体的每个部分的位置，第一个元素是头部
+    # 每个位置是一个 (x, y) 坐标元组，元组可以放进集合
+    snake_pos = deque([(GRID_WIDTH//2, GRID_HEIGHT//2)])
+    # 蛇身占据的格子集合，与 snake_pos 保持一致
+    occupied = set(snake_pos)
+    # 空闲格子索引，蛇每占据或离开一个格子都同步更新
+    free_cells, free_index = make_free_cells()
+    take_cell(free_cells, free_index, snake_pos[0])
     # 方向向量：[x, y]表示移动方向
     snake_direction = [1, 0]  # 初始向右移动
     
     # 初始化食物位置
-    food_pos = generate_food(snake_pos)
+    food_pos = generate_food(free_cells)
     
     # 初始化分数
     score = 0
@@ -153,10 +191,10 @@ def main():
         
         # 更新蛇的位置
         # 计算新的头部位置：当前位置 + 移动方向
-        new_head = [
+        new_head = (
             snake_pos[0][0] + snake_direction[0],  # x坐标
             snake_pos[0][1] + snake_direction[1]   # y坐标
-        ]
+        )
         
         # 检查是否撞墙
         # 使用 or 运算符检查是否超出边界
@@ -166,26 +204,35 @@ def main():
             sys.exit()
         
         # 检查是否撞到自己
-        # 使用 in 运算符检查新头部是否在蛇身列表中
-        if new_head in snake_pos:
+        # 使用 in 运算符检查新头部是否在蛇身占据的格子集合中
+        if new_head in occupied:
             pygame.quit()
             sys.exit()
         
-        # 将新头部添加到蛇身列表的开头
-        # insert(0, new_head) 在列表开头插入新元素
-        snake_pos.insert(0, new_head)
+        # 将新头部添加到蛇身队列的开头
+        # appendleft(new_head) 在队列开头插入新元素
+        snake_pos.appendleft(new_head)
+        occupied.add(new_head)
+        take_cell(free_cells, free_index, new_head)
         
         # 检查是否吃到食物
-        # 使用 == 运算符比较两个列表是否相等
+        # 使用 == 运算符比较两个元组是否相等
         if new_head == food_pos:
             # 增加分数
             score += 10
             # 生成新的食物
-            food_pos = generate_food(snake_pos)
+            food_pos = generate_food(free_cells)
+            # 没有空闲格子了：蛇占满了整个网格，游戏胜利
+            if food_pos is None:
+                print(f'You Win! Score: {score}')
+                pygame.quit()
+                sys.exit()
         else:
             # 如果没有吃到食物，删除尾部
-            # pop() 删除并返回列表的最后一个元素
-            snake_pos.pop()
+            # pop() 删除并返回队列的最后一个元素
+            tail = snake_pos.pop()
+            occupied.remove(tail)
+            release_cell(free_cells, free_index, tail)
         
         # 清空屏幕
         # fill() 用指定颜色填充整个屏幕
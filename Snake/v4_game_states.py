@@ -51,6 +51,7 @@
 ## 游戏规则
 - 每吃到一个食物得10分
 - 撞墙或撞到自己身体游戏结束
+- 蛇占满整个网格时胜利
 - 可以随时暂停游戏
 - 游戏结束后可以选择重新开始
 """
@@ -59,9 +60,11 @@
 # pygame: 用于创建游戏的Python库
 # sys: 提供与Python解释器和运行环境相关的变量和函数
 # random: 用于生成随机数
+# deque: 双端队列，两端添加和删除元素都很快
 import pygame
 import sys
 import random
+from collections import deque
 
 # 初始化 Pygame
 # pygame.init() 初始化所有Pygame模块，在使用Pygame功能前必须调用
@@ -103,23 +106,47 @@ font = pygame.font.Font(None, 36)
 # 创建标题字体对象，72是字体大小
 title_font = pygame.font.Font(None, 72)
 
-def generate_food(snake_pos):
+def make_free_cells():
     """
-    生成新的食物，确保不会生成在蛇身上
+    创建空闲格子索引：记录所有没有被蛇占据的格子
+    返回：
+        free_cells: 空闲格子的列表，随机选一个元素就是均匀地选一个空闲格子
+        free_index: 字典，记录每个空闲格子在 free_cells 中的下标
+    """
+    free_cells = [(x, y) for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)]
+    free_index = {cell: i for i, cell in enumerate(free_cells)}
+    return free_cells, free_index
+
+def take_cell(free_cells, free_index, cell):
+    """
+    蛇占据了一个格子：把它从空闲格子索引中删除
+    用列表的最后一个元素填补它的位置（交换删除），不需要移动其他元素，是 O(1)
+    """
+    i = free_index.pop(cell)
+    last = free_cells.pop()
+    if last != cell:
+        free_cells[i] = last
+        free_index[last] = i
+
+def release_cell(free_cells, free_index, cell):
+    """
+    蛇离开了一个格子：把它加回空闲格子索引
+    """
+    free_index[cell] = len(free_cells)
+    free_cells.append(cell)
+
+def generate_food(free_cells):
+    """
+    生成新的食物，从空闲格子中均匀地随机选一个，不会生成在蛇身上
     参数：
-        snake_pos: 蛇身体的位置列表
+        free_cells: 空闲格子的列表
     返回：
-        新的食物位置 [x, y]
+        新的食物位置 (x, y)；没有空闲格子（蛇占满了整个网格）时返回 None
     """
-    while True:
-        # random.randint(a, b) 生成a到b之间的随机整数（包含a和b）
-        food_pos = [
-            random.randint(0, GRID_WIDTH-1),  # 随机x坐标
-            random.randint(0, GRID_HEIGHT-1)  # 随机y坐标
-        ]
-        # 确保食物不会生成在蛇身上
-        if food_pos not in snake_pos:
-            return food_pos
+    if not free_cells:
+        return None
+    # random.choice() 从列表中随机选择一个元素
+    return random.choice(free_cells)
 
 def draw_text(text, font, color, x, y):
     """
@@ -170,11 +197,12 @@ def show_start_screen():
                     pygame.quit()
                     sys.exit()
 
-def show_game_over_screen(score):
+def show_game_over_screen(score, won=False):
     """
     显示游戏结束界面
     参数：
         score: 最终得分
+        won: 是否因为蛇占满整个网格而胜利
     返回：
         True: 重新开始游戏
         False: 退出游戏
@@ -183,7 +211,10 @@ def show_game_over_screen(score):
         # 清空屏幕
         screen.fill(BLACK)
         # 绘制游戏结束信息和分数
-        draw_text("Game Over", title_font, RED, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
+        if won:
+            draw_text("You Win!", title_font, GREEN, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
+        else:
+            draw_text("Game Over", title_font, RED, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
         draw_text(f"Score: {score}", font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
         draw_text("Press SPACE to Restart", font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT*2//3)
         draw_text("Press ESC to Quit", font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT*3//4)
@@ -214,11 +245,17 @@ def main():
         show_start_screen()
         
         # 初始化游戏状态
-        snake_pos = [[GRID_WIDTH//2, GRID_HEIGHT//2]]
+        # 蛇身用双端队列存储 (x, y) 元组，occupied 集合记录蛇身占据的格子
+        snake_pos = deque([(GRID_WIDTH//2, GRID_HEIGHT//2)])
+        occupied = set(snake_pos)
+        # 空闲格子索引，蛇每占据或离开一个格子都同步更新
+        free_cells, free_index = make_free_cells()
+        take_cell(free_cells, free_index, snake_pos[0])
         snake_direction = [1, 0]
-        food_pos = generate_food(snake_pos)
+        food_pos = generate_food(free_cells)
         score = 0
         paused = False
+        won = False  # 蛇占满整个网格时胜利
         
         # 游戏主循环
         while True:
@@ -248,29 +285,37 @@ def main():
             # 只有在非暂停状态下才更新游戏状态
             if not paused:
                 # 更新蛇的位置
-                new_head = [
+                new_head = (
                     snake_pos[0][0] + snake_direction[0],
                     snake_pos[0][1] + snake_direction[1]
-                ]
+                )
                 
                 # 检查是否撞墙
                 if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or
                     new_head[1] < 0 or new_head[1] >= GRID_HEIGHT):
                     break
                 
-                # 检查是否撞到自己
-                if new_head in snake_pos:
+                # 检查是否撞到自己（集合查找是 O(1)，与蛇的长度无关）
+                if new_head in occupied:
                     break
                 
-                # 将新头部添加到蛇身列表的开头
-                snake_pos.insert(0, new_head)
+                # 将新头部添加到蛇身队列的开头
+                snake_pos.appendleft(new_head)
+                occupied.add(new_head)
+                take_cell(free_cells, free_index, new_head)
                 
                 # 检查是否吃到食物
                 if new_head == food_pos:
                     score += 10
-                    food_pos = generate_food(snake_pos)
+                    food_pos = generate_food(free_cells)
+                    # 没有空闲格子了：蛇占满了整个网格，游戏胜利
+                    if food_pos is None:
+                        won = True
+                        break
                 else:
-                    snake_pos.pop()
+                    tail = snake_pos.pop()
+                    occupied.remove(tail)
+                    release_cell(free_cells, free_index, tail)
             
             # 清空屏幕
             screen.fill(BLACK)
@@ -308,7 +353,7 @@ def main():
             clock.tick(10)
         
         # 显示游戏结束界面
-        if not show_game_over_screen(score):
+        if not show_game_over_screen(score, won):
             break
 
 # Python的特殊语法：当这个文件被直接运行时（而不是被导入时）
@@ -13,23 +13,30 @@
 - **类（Class）**：将相关的数据和方法组织在一起
 - **对象（Object）**：类的实例，包含具体的数据
 - **封装**：将数据和方法封装在类中
-- **继承**：可以基于现有类创建新类（本版本未使用）
+- **继承**：可以基于现有类创建新类（Snake 和 Food 继承 snake_env.py 中的同名类，只添加绘制方法）
 
 ### 2. 游戏类结构
+游戏规则在 snake_env.py 中，不依赖 Pygame，可以在没有显示器的环境中运行和训练智能体。
 - **Snake类**：
   - 管理蛇的位置和移动
   - 处理碰撞检测
   - 控制蛇的生长
   - 绘制蛇的外观
+  - 蛇身存放在双端队列中，另用集合记录占据的格子，移动、生长和碰撞检测都是 O(1)
+- **FreeCells类**（snake_env.py）：
+  - 记录没有被蛇占据的格子，蛇移动时同步更新
+  - 交换删除：用最后一个元素填补被删除的位置，添加和删除都是 O(1)
 - **Food类**：
   - 管理食物的位置
-  - 生成新的食物
+  - 从空闲格子中均匀地随机选择新的食物位置，不需要反复试探
   - 绘制食物的外观
+- **SnakeEnv类**（snake_env.py）：
+  - 实现游戏规则：`reset()` 开始新的一局，`step()` 前进一步
 - **Game类**：
   - 管理游戏主循环
   - 处理用户输入
   - 控制游戏状态
-  - 协调各个组件
+  - 协调各个组件，每一帧调用环境的 `step()`
 
 ### 3. 类的方法
 - **初始化方法**：`__init__` 设置初始状态
@@ -52,6 +59,7 @@
 ## 游戏规则
 - 每吃到一个食物得10分
 - 撞墙或撞到自己身体游戏结束
+- 蛇占满整个网格时胜利
 - 可以随时暂停游戏
 - 游戏结束后可以选择重新开始
 
@@ -65,14 +73,11 @@
 # 导入必要的库
 # pygame: 用于创建游戏的Python库
 # sys: 提供与Python解释器和运行环境相关的变量和函数
-# random: 用于生成随机数
+# snake_env: 不依赖 Pygame 的游戏规则
 import pygame
 import sys
-import random
-
-# 初始化 Pygame
-# pygame.init() 初始化所有Pygame模块，在使用Pygame功能前必须调用
-pygame.init()
+import snake_env
+from snake_env import UP, RIGHT, DOWN, LEFT
 
 # 定义颜色常量
 # 在Pygame中，颜色使用RGB格式表示：(红, 绿, 蓝)
@@ -92,62 +97,23 @@ GRID_SIZE = 20        # 每个网格的大小（像素）
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE   # 计算网格的宽度数量
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE # 计算网格的高度数量
 
-class Snake:
+# 方向键对应的动作
+KEY_ACTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+}
+
+class Snake(snake_env.Snake):
     """
-    蛇类：管理蛇的所有属性和行为
+    蛇类：在 snake_env.Snake（位置、移动、生长和碰撞检测）的基础上添加绘制
     """
     def __init__(self):
         """
         初始化方法：创建蛇的初始状态
         """
-        self.reset()
-    
-    def reset(self):
-        """
-        重置方法：将蛇恢复到初始状态
-        """
-        # 初始化蛇的位置和方向
-        self.positions = [[GRID_WIDTH//2, GRID_HEIGHT//2]]
-        self.direction = [1, 0]  # 初始向右移动
-    
-    def move(self):
-        """
-        移动方法：根据当前方向移动蛇
-        返回：
-            新的头部位置 [x, y]
-        """
-        # 计算新的头部位置
-        new_head = [
-            self.positions[0][0] + self.direction[0],
-            self.positions[0][1] + self.direction[1]
-        ]
-        # 将新头部添加到蛇身列表的开头
-        self.positions.insert(0, new_head)
-        return new_head
-    
-    def grow(self):
-        """
-        生长方法：让蛇变长（不删除尾部）
-        """
-        pass  # 不删除尾部即可实现增长
-    
-    def check_collision(self, new_head):
-        """
-        碰撞检测方法：检查是否发生碰撞
-        参数：
-            new_head: 新的头部位置 [x, y]
-        返回：
-            True: 发生碰撞
-            False: 未发生碰撞
-        """
-        # 检查是否撞墙
-        if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or
-            new_head[1] < 0 or new_head[1] >= GRID_HEIGHT):
-            return True
-        # 检查是否撞到自己
-        if new_head in self.positions:
-            return True
-        return False
+        super().__init__(GRID_WIDTH, GRID_HEIGHT)
     
     def draw(self, screen):
         """
@@ -165,35 +131,10 @@ class Snake:
             )
             pygame.draw.rect(screen, GREEN, rect)
 
-class Food:
+class Food(snake_env.Food):
     """
-    食物类：管理食物的属性和行为
+    食物类：在 snake_env.Food（位置和生成）的基础上添加绘制
     """
-    def __init__(self):
-        """
-        初始化方法：创建食物的初始状态
-        """
-        self.position = [0, 0]
-        self.generate()
-    
-    def generate(self, snake_positions=None):
-        """
-        生成方法：生成新的食物位置
-        参数：
-            snake_positions: 蛇身体的位置列表，用于避免食物生成在蛇身上
-        """
-        if snake_positions is None:
-            snake_positions = []
-        while True:
-            # 生成随机位置
-            self.position = [
-                random.randint(0, GRID_WIDTH-1),
-                random.randint(0, GRID_HEIGHT-1)
-            ]
-            # 确保食物不会生成在蛇身上
-            if self.position not in snake_positions:
-                break
-    
     def draw(self, screen):
         """
         绘制方法：在屏幕上绘制食物
@@ -216,6 +157,11 @@ class Game:
         """
         初始化方法：创建游戏窗口和初始化游戏状态
         """
+        # 初始化 Pygame
+        # pygame.init() 初始化所有Pygame模块，在使用Pygame功能前必须调用
+        # 放在这里而不是模块顶层，这样导入本模块时不会初始化显示
+        pygame.init()
+        
         # 创建游戏窗口
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('Snake Game v5 - OOP')
@@ -228,14 +174,28 @@ class Game:
         self.font = pygame.font.Font(None, 36)
         self.title_font = pygame.font.Font(None, 72)
         
-        # 创建游戏对象
+        # 创建游戏对象，由环境按游戏规则更新
         self.snake = Snake()
         self.food = Food()
+        self.env = snake_env.SnakeEnv(GRID_WIDTH, GRID_HEIGHT, snake=self.snake, food=self.food)
         
         # 初始化游戏状态
-        self.score = 0
         self.paused = False
     
+    @property
+    def score(self):
+        """
+        当前分数
+        """
+        return self.env.score
+    
+    @property
+    def won(self):
+        """
+        是否因为蛇占满整个网格而胜利
+        """
+        return self.env.won
+    
     def draw_text(self, text, font, color, x, y):
         """
         文本绘制方法：在屏幕上绘制文本
@@ -281,7 +241,10 @@ class Game:
         """
         while True:
             self.screen.fill(BLACK)
-            self.draw_text("Game Over", self.title_font, RED, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
+            if self.won:
+                self.draw_text("You Win!", self.title_font, GREEN, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
+            else:
+                self.draw_text("Game Over", self.title_font, RED, WINDOW_WIDTH//2, WINDOW_HEIGHT//3)
             self.draw_text(f"Score: {self.score}", self.font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
             self.draw_text("Press SPACE to Restart", self.font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT*2//3)
             self.draw_text("Press ESC to Quit", self.font, WHITE, WINDOW_WIDTH//2, WINDOW_HEIGHT*3//4)
@@ -314,15 +277,9 @@ class Game:
                 elif event.key == pygame.K_SPACE:
                     self.paused = not self.paused
                 # 只有在非暂停状态下才处理方向键
-                elif not self.paused:
-                    if event.key == pygame.K_UP and self.snake.direction != [0, 1]:
-                        self.snake.direction = [0, -1]
-                    elif event.key == pygame.K_DOWN and self.snake.direction != [0, -1]:
-                        self.snake.direction = [0, 1]
-                    elif event.key == pygame.K_LEFT and self.snake.direction != [1, 0]:
-                        self.snake.direction = [-1, 0]
-                    elif event.key == pygame.K_RIGHT and self.snake.direction != [-1, 0]:
-                        self.snake.direction = [1, 0]
+                # 不能直接掉头，由 turn() 检查
+                elif not self.paused and event.key in KEY_ACTIONS:
+                    self.snake.turn(KEY_ACTIONS[event.key])
     
     def update(self):
         """
@@ -332,21 +289,9 @@ class Game:
             False: 游戏结束
         """
         if not self.paused:
-            # 移动蛇并获取新的头部位置
-            new_head = self.snake.move()
-            
-            # 检查碰撞
-            if self.snake.check_collision(new_head):
-                return False
-            
-            # 检查是否吃到食物
-            if new_head == self.food.position:
-                self.score += 10
-                self.food.generate(self.snake.positions)
-            else:
-                self.snake.positions.pop()
-            
-            return True
+            # 按当前方向前进一步，规则见 snake_env.SnakeEnv.step
+            _, _, done, _ = self.env.step()
+            return not done
         return True
     
     def draw(self):
@@ -379,9 +324,7 @@ class Game:
             self.show_start_screen()
             
             # 重置游戏状态
-            self.snake.reset()
-            self.food.generate()
-            self.score = 0
+            self.env.reset()
             self.paused = False
             
             # 游戏主循环
@@ -0,0 +1,119 @@
+"""
+扫雷图块图集：把 img/ 下的 14 张 GIF 按单元格大小缩放后拼成一张图，并转换为显示格式。
+
+每种单元格大小只构建一次，结果缓存在 .cache/ 目录中；之后启动直接读取缓存。
+绘制时从图集中按子矩形取图块，不再为每次 blit 做像素格式转换。
+"""
+
+# 导入必要的库
+import os  # 用于处理文件路径
+
+import numpy as np  # 用于一次性计算整个游戏板的图块索引
+import pygame  # 用于加载、缩放和保存图像
+
+from engine import COVERED, REVEALED, FLAGGED, UNKNOWN
+
+# 获取当前脚本的目录
+script_dir = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(script_dir, 'img')  # 原始图块所在目录
+CACHE_DIR = os.path.join(script_dir, '.cache')  # 缓存图集的目录
+TILE_COUNT = 14  # 图块数量：0-8 数字、覆盖、旗帜、地雷、问号、踩中的地雷
+
+# 图块索引：0-8 为数字，其余为特殊图块
+TILE_COVERED = 9  # 覆盖
+TILE_FLAG = 10  # 旗帜
+TILE_MINE = 11  # 地雷
+TILE_UNK = 12  # 问号
+TILE_DEAD = 13  # 踩中的地雷
+
+
+def tile_indices(board):
+    """一次性计算整个游戏板每个单元格要绘制的图像索引。"""
+    tiles = np.full((board.rows, board.cols), TILE_COVERED, dtype=np.uint8)  # 默认绘制覆盖图像
+    tiles[board.state == FLAGGED] = TILE_FLAG  # 旗帜
+    tiles[board.state == UNKNOWN] = TILE_UNK  # 问号
+    revealed = board.state == REVEALED  # 已揭示的单元格
+    tiles[revealed] = board.adjacent[revealed]  # 数字图像的索引就是相邻地雷数
+    tiles[revealed & board.mines] = TILE_MINE  # 已揭示的地雷
+    if board.dead is not None:  # 踩中的地雷
+        tiles[board.dead] = TILE_DEAD
+    return tiles
+
+
+def cell_tile(state, is_mine, adjacent, dead):
+    """由单元格的状态、是否地雷、相邻地雷数和是否踩中的地雷计算要绘制的图像索引，规则与 tile_indices 一致。"""
+    if state == COVERED:
+        return TILE_COVERED
+    if state == FLAGGED:
+        return TILE_FLAG
+    if state == UNKNOWN:
+        return TILE_UNK
+    if is_mine:
+        return TILE_DEAD if dead else TILE_MINE
+    return int(adjacent)
+
+
+def tile_index(board, row, col):
+    """计算单个单元格要绘制的图像索引。"""
+    return cell_tile(board.state[row, col], board.mines[row, col], board.adjacent[row, col],
+                     board.dead == (row, col))
+
+
+def tile_paths():
+    """返回所有原始图块文件的路径。"""
+    return [os.path.join(IMAGE_DIR, f'{num}.gif') for num in range(TILE_COUNT)]
+
+
+def build_atlas(cell_size):
+    """加载并缩放所有图块，纵向拼接成一张图集（未转换格式）。
+
+    纵向排列让每个图块都从第0列开始，像素行的内存对齐与单独的图块相同；
+    横向排列时一半图块的子矩形起点不对齐，SDL 的 blit 会慢好几倍。
+    """
+    atlas = pygame.Surface((cell_size, cell_size * TILE_COUNT))
+    for index, path in enumerate(tile_paths()):
+        image = pygame.transform.scale(pygame.image.load(path), (cell_size, cell_size))
+        atlas.blit(image, (0, index * cell_size))
+    return atlas
+
+
+def load_atlas(cell_size, cache_dir=CACHE_DIR):
+    """读取缓存的图集；缓存不存在、比原始图块旧或已损坏时重新构建并写入缓存。"""
+    path = os.path.join(cache_dir, f'atlas_{cell_size}.png')
+    newest = max(os.path.getmtime(p) for p in tile_paths())  # 原始图块的最新修改时间
+    if os.path.exists(path) and os.path.getmtime(path) >= newest:
+        try:
+            atlas = pygame.image.load(path)
+            if atlas.get_size() == (cell_size, cell_size * TILE_COUNT):  # 尺寸不符说明缓存已过时
+                return atlas
+        except pygame.error:  # 缓存损坏，重新构建
+            pass
+
+    atlas = build_atlas(cell_size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = f'{path}.{os.getpid()}.png'  # 先写临时文件再替换，避免多个进程同时写坏缓存
+        pygame.image.save(atlas, temp)
+        os.replace(temp, path)
+    except (OSError, pygame.error):  # 缓存只是加速手段，写不进去也不影响游戏
+        pass
+    return atlas
+
+
+class TileAtlas:
+    """已转换为显示格式的图块图集。必须在 pygame.display.set_mode 之后创建。"""
+
+    def __init__(self, cell_size, cache_dir=CACHE_DIR):
+        self.cell_size = cell_size  # 单元格大小
+        self.surface = load_atlas(cell_size, cache_dir).convert()  # 转换为显示格式，blit 时无需再转换
+        # 每个图块在图集中的子矩形
+        self.rects = [pygame.Rect(0, index * cell_size, cell_size, cell_size) for index in range(TILE_COUNT)]
+
+    def blit(self, screen, index, position):
+        """在 position 处绘制第 index 个图块，返回绘制的矩形。"""
+        return screen.blit(self.surface, position, self.rects[index])
+
+    def blits(self, screen, tiles):
+        """批量绘制 (index, position) 序列中的图块。"""
+        surface, rects = self.surface, self.rects
+        screen.blits([(surface, position, rects[index]) for index, position in tiles], doreturn=False)
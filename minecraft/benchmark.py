@@ -0,0 +1,712 @@
+#!/bin/env python
+"""
+扫雷引擎性能基准测试
+
+运行方式：
+    python benchmark.py adjacent            # 相邻地雷计数：10x10 到 4000x4000
+    python benchmark.py cascade             # 空白区域连锁揭示：最大 2000x2000
+    python benchmark.py mines               # 地雷放置：密度 10% 到 90%
+    python benchmark.py save                # 二进制存档的读写速度和体积
+    python benchmark.py import              # 在新进程中导入 engine 的耗时
+    python benchmark.py atlas               # 图块图集的启动耗时和 blit 吞吐量
+    python benchmark.py text                # 文字缓存与每帧创建字体、渲染文字的对比
+    python benchmark.py v1render            # v1 程序化渲染（预渲染图块）与图像渲染器的帧耗时
+    python benchmark.py chunked             # 懒加载游戏板：内存与已探索区域成正比
+    python benchmark.py solver              # 提示引擎：增量更新与每次从头推导的对比
+    python benchmark.py probability         # 地雷概率：分量缓存对整局逐步计算的加速
+    python benchmark.py bitboard            # 位棋盘引擎与原先的 Cell 列表：生成、连锁揭示、胜利检查
+    python benchmark.py suite               # 完整基准：结果保存为 JSON，并与回归阈值比较
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import importlib.util  # 用于按路径加载 v1/main.py
+import json  # 用于保存基准结果和回归阈值
+import os  # 用于定位脚本目录
+import platform  # 用于在结果中记录运行环境
+import pickle  # 用于和旧的存档方式对比体积
+import random  # 用于生成随机地雷
+import subprocess  # 用于在新进程中测量导入时间
+import sys  # 用于找到当前的 Python 解释器
+import tempfile  # 用于存放测试用的图集缓存
+import time  # 用于计时
+
+import numpy as np
+
+import engine
+
+# 默认测试的游戏板边长
+SIZES = [10, 100, 500, 1000, 2000, 4000]
+DENSITY = 0.15  # 默认地雷密度
+
+# 完整基准（suite）的游戏板边长和地雷密度
+SUITE_SIZES = [10, 100, 500, 1000, 2000]
+SUITE_DENSITIES = [0.1, 0.15, 0.2]
+SEQUENCE_LENGTH = 50  # handle_click 序列的点击数
+THRESHOLD_MARGIN = 3.0  # 更新阈值时在本次结果上留的余量（倍数）
+THRESHOLD_FLOOR = 0.001  # 阈值至少比本次结果多1毫秒，避免微秒级的测量抖动被当作回归
+script_dir = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(script_dir, 'benchmark_results.json')  # 基准结果
+THRESHOLDS_PATH = os.path.join(script_dir, 'benchmark_thresholds.json')  # 回归阈值（秒）
+
+
+def timeit(func, repeat=3):
+    """运行 func 若干次，返回最短耗时（秒）和最后一次的返回值。"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def random_mines(rows, cols, density, seed=0):
+    """生成指定密度的随机地雷掩码。"""
+    rng = np.random.default_rng(seed)
+    return rng.random((rows, cols)) < density
+
+
+def make_board(rows, cols, density, seed=0):
+    """构造一个指定大小和密度、地雷已放置的游戏板。"""
+    mines = random_mines(rows, cols, density, seed)
+    board = engine.Board(rows, cols, int(mines.sum()))
+    board.mines[:] = mines
+    board.adjacent[:] = engine.count_adjacent_mines(board.mines)
+    board.mines_placed = True
+    return board
+
+
+def first_empty_cell(board):
+    """返回第一个相邻地雷数为0的非地雷单元格。"""
+    index = int(np.flatnonzero((board.adjacent == 0) & ~board.mines)[0])
+    return divmod(index, board.cols)
+
+
+# --- 旧实现（逐格的 Cell 列表），作为对照 ---
+
+def legacy_count_adjacent(mines):
+    """原先 create_board 中的四重循环算法，返回 'number_N' 字符串组成的二维列表。"""
+    board = [[engine.Cell('mine' if m else 'number', 'covered') for m in row] for row in mines.tolist()]
+    legacy_number_cells(board)
+    return [[cell.value for cell in row] for row in board]
+
+
+def legacy_number_cells(board):
+    """在 Cell 列表上逐格数出相邻地雷数，把非地雷单元格的值改为 'number_N'。"""
+    rows, cols = len(board), len(board[0])
+    for r in range(rows):
+        for c in range(cols):
+            if board[r][c].value != 'mine':
+                num_adjacent_mines = 0
+                for dr in [-1, 0, 1]:
+                    for dc in [-1, 0, 1]:
+                        if dr == 0 and dc == 0:
+                            continue
+                        nr, nc = r + dr, c + dc
+                        if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc].value == 'mine':
+                            num_adjacent_mines += 1
+                board[r][c].value = f'number_{num_adjacent_mines}'
+
+
+def legacy_place_mines(rows, cols, num_mines):
+    """原先 create_board 中的拒绝采样：随机抽 (row, col) 直到抽中不是地雷的格子。"""
+    board = [[engine.Cell('number', 'covered') for _ in range(cols)] for _ in range(rows)]
+    mines_placed = 0
+    while mines_placed < num_mines:
+        row = random.randint(0, rows - 1)
+        col = random.randint(0, cols - 1)
+        if board[row][col].value != 'mine':
+            board[row][col].value = 'mine'
+            mines_placed += 1
+    return board
+
+
+def legacy_reveal_empty_cells(board, row, col):
+    """原先的递归连锁揭示。"""
+    if not (0 <= row < len(board) and 0 <= col < len(board[0])) or board[row][col].state != 'covered':
+        return
+    cell = board[row][col]
+    cell.state = 'revealed'
+    if cell.value == 'number_0':
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                if dr == 0 and dc == 0:
+                    continue
+                legacy_reveal_empty_cells(board, row + dr, col + dc)
+
+
+def legacy_check_win(board, total_non_mines):
+    """原先的胜利检查：全板扫描统计已揭示的非地雷单元格。"""
+    revealed_non_mines = 0
+    for row in board:
+        for cell in row:
+            if cell.state == 'revealed' and cell.value != 'mine':
+                revealed_non_mines += 1
+    return revealed_non_mines == total_non_mines
+
+
+# --- 各项基准 ---
+
+def bench_adjacent(sizes, legacy_max):
+    """比较向量化相邻计数与旧的循环实现，并校验结果一致。"""
+    print(f'{"size":>11} {"vectorized":>12} {"legacy":>12} {"speedup":>9}')
+    for size in sizes:
+        mines = random_mines(size, size, DENSITY)
+        fast, counts = timeit(lambda: engine.count_adjacent_mines(mines))
+        if size <= legacy_max:
+            slow, legacy = timeit(lambda: legacy_count_adjacent(mines), repeat=1)
+            # 非地雷格的结果必须与旧实现完全一致
+            for r, row in enumerate(legacy):
+                for c, value in enumerate(row):
+                    if value != 'mine':
+                        assert value == f'number_{counts[r, c]}', (size, r, c)
+            print(f'{size:>5}x{size:<5} {fast * 1e3:>10.2f}ms {slow * 1e3:>10.2f}ms {slow / fast:>8.1f}x')
+        else:
+            print(f'{size:>5}x{size:<5} {fast * 1e3:>10.2f}ms {"-":>12} {"-":>9}')
+
+
+def bench_cascade(sizes, density):
+    """测量从一个空单元格开始的连锁揭示耗时。"""
+    print(f'{"size":>11} {"revealed":>10} {"time":>10} {"per cell":>10}')
+    for size in sizes:
+        board = make_board(size, size, density)
+        row, col = first_empty_cell(board)
+
+        def run():
+            board.state[:] = engine.COVERED  # 每次都从全覆盖开始
+            board.revealed_safe = 0
+            return engine.reveal_empty_cells(board, row, col)
+
+        elapsed, revealed = timeit(run)
+        print(f'{size:>5}x{size:<5} {len(revealed):>10} {elapsed * 1e3:>8.1f}ms '
+              f'{elapsed / len(revealed) * 1e9:>8.0f}ns')
+
+
+def bench_mines(sizes, densities, legacy_max):
+    """比较抽样放置地雷与旧的拒绝采样在不同密度下的耗时。"""
+    print(f'{"size":>11} {"density":>8} {"sampled":>12} {"legacy":>12}')
+    for size in sizes:
+        for density in densities:
+            num_mines = int(size * size * density)
+            row, col = size // 2, size // 2  # 第一次点击的位置
+
+            def run():
+                board = engine.Board(size, size, num_mines)
+                engine.place_mines(board, row, col)
+                return board
+
+            fast, board = timeit(run)
+            # 地雷数量正确，且第一次点击的格子及其邻居都没有地雷
+            assert int(board.mines.sum()) == num_mines
+            assert not board.mines[row - 1:row + 2, col - 1:col + 2].any()
+            if size <= legacy_max:
+                slow, _ = timeit(lambda: legacy_place_mines(size, size, num_mines), repeat=1)
+                legacy = f'{slow * 1e3:>10.2f}ms'
+            else:
+                legacy = f'{"-":>12}'
+            print(f'{size:>5}x{size:<5} {density:>8.0%} {fast * 1e3:>10.2f}ms {legacy}')
+
+
+def bench_save(sizes, density, legacy_max):
+    """测量二进制存档的读写耗时，并与 pickle 一个 Cell 列表的体积对比。"""
+    print(f'{"size":>11} {"bytes":>10} {"pickle":>10} {"dump":>10} {"load":>10}')
+    for size in sizes:
+        board = make_board(size, size, density)
+        board.state[:] = random_mines(size, size, 0.5, seed=1)  # 一半单元格已揭示
+        dump, data = timeit(lambda: engine.dumps_board(board))
+        load, loaded = timeit(lambda: engine.loads_board(data))
+        assert (loaded.mines == board.mines).all() and (loaded.state == board.state).all()
+        if size <= legacy_max:
+            cells = [[board.cell(r, c) for c in range(size)] for r in range(size)]
+            legacy = f'{len(pickle.dumps(cells)):>10}'
+        else:
+            legacy = f'{"-":>10}'
+        print(f'{size:>5}x{size:<5} {len(data):>10} {legacy} {dump * 1e3:>8.2f}ms {load * 1e3:>8.2f}ms')
+
+
+def bench_import(repeat):
+    """在新的 Python 进程中测量导入 engine 的耗时，并确认没有连带导入 pygame。"""
+    code = ('import time, sys; start = time.perf_counter(); import engine; '
+            'print(time.perf_counter() - start, "pygame" in sys.modules)')
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=script_dir,
+                                capture_output=True, text=True, check=True).stdout.split()
+        assert output[1] == 'False', 'engine must not import pygame'
+        times.append(float(output[0]))
+    print(f'import engine: best {min(times) * 1e3:.1f}ms, median {sorted(times)[len(times) // 2] * 1e3:.1f}ms')
+
+
+def init_display(width, height):
+    """用 SDL 的虚拟视频驱动创建窗口，渲染基准不需要真正的显示器。"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+    return pygame.display.set_mode((width, height))
+
+
+def bench_atlas(cell_size, count):
+    """比较逐张加载缩放的 GIF 与转换为显示格式的图集：启动耗时和 blit 吞吐量。"""
+    screen = init_display(cell_size * 20, cell_size * 20)
+    import pygame
+    import atlas
+
+    def legacy_load():  # 原先 main.py 的加载方式：不调用 convert()
+        return [pygame.transform.scale(pygame.image.load(path), (cell_size, cell_size))
+                for path in atlas.tile_paths()]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        legacy_start, images = timeit(legacy_load)
+        cold_start, _ = timeit(lambda: atlas.TileAtlas(cell_size, cache_dir), repeat=1)  # 构建并写入缓存
+        warm_start, tiles = timeit(lambda: atlas.TileAtlas(cell_size, cache_dir))  # 读取缓存
+    print(f'startup: legacy {legacy_start * 1e3:.2f}ms, atlas cold {cold_start * 1e3:.2f}ms, '
+          f'atlas warm {warm_start * 1e3:.2f}ms')
+
+    rng = random.Random(0)
+    draws = [(rng.randrange(atlas.TILE_COUNT), (rng.randrange(20) * cell_size, rng.randrange(20) * cell_size))
+             for _ in range(count)]
+
+    def legacy_blit():
+        for index, position in draws:
+            screen.blit(images[index], position)
+
+    def atlas_blit():
+        for index, position in draws:
+            tiles.blit(screen, index, position)
+
+    for name, func in [('legacy blit', legacy_blit), ('atlas blit', atlas_blit),
+                       ('atlas blits', lambda: tiles.blits(screen, draws))]:
+        elapsed, _ = timeit(func)
+        print(f'{name:>12}: {count / elapsed / 1e3:>8.1f}k tiles/s')
+
+
+def bench_text(count):
+    """比较每次都创建字体并渲染文字与使用 text_cache 的耗时。"""
+    init_display(300, 300)
+    import pygame
+    import text_cache
+
+    texts = [str(num) for num in range(1, 9)] + ['You Win!', 'Game Over!']
+
+    def uncached():  # 原先的做法：每次都创建字体再渲染
+        for i in range(count):
+            pygame.font.Font(None, 25).render(texts[i % len(texts)], True, (0, 0, 0))
+
+    def cached():
+        for i in range(count):
+            text_cache.render_text(texts[i % len(texts)], 25, (0, 0, 0))
+
+    for name, func in [('uncached', uncached), ('cached', cached)]:
+        elapsed, _ = timeit(func)
+        print(f'{name:>9}: {elapsed / count * 1e6:>8.2f}us per text')
+
+
+def load_module(name, path):
+    """按文件路径加载一个模块（v1/main.py 不在导入路径上，且与 main.py 同名）。"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_v1_draw(v1, screen):
+    """v1/main.py 原先逐格绘制矩形和线条的渲染方式，作为对照。"""
+    import pygame
+    from text_cache import render_text
+    size = v1.CELL_SIZE
+    for r in range(v1.ROWS):
+        for c in range(v1.COLS):
+            cell = v1.board[r][c]
+            x, y = c * size, r * size
+            rect = pygame.Rect(x, y, size, size)
+            if cell.state == 'covered':
+                pygame.draw.rect(screen, v1.GRAY, rect, 0)
+                pygame.draw.line(screen, v1.WHITE, (x, y), (x + size - 1, y), 1)
+                pygame.draw.line(screen, v1.WHITE, (x, y), (x, y + size - 1), 1)
+                pygame.draw.line(screen, v1.BLACK, (x + size - 1, y), (x + size - 1, y + size - 1), 1)
+                pygame.draw.line(screen, v1.BLACK, (x, y + size - 1), (x + size - 1, y + size - 1), 1)
+            elif cell.state == 'revealed':
+                pygame.draw.rect(screen, v1.LIGHT, rect, 0)
+                pygame.draw.rect(screen, v1.DARK, rect, 1)
+                if 'mine' in cell.value:
+                    screen.blit(v1.mine_image, rect.topleft)
+                elif 'number' in cell.value:
+                    num = int(cell.value.split('_')[1])
+                    if num > 0:
+                        text = render_text(str(num), 25, v1.BLACK)
+                        screen.blit(text, text.get_rect(center=rect.center))
+
+
+def bench_v1render(size, cell_size, revealed):
+    """在 size x size 的游戏板上比较 v1 的渲染（改造前后）与基于图块图集的 main.draw_board。"""
+    init_display(300, 300)
+    import pygame
+    v1 = load_module('v1_main', os.path.join(script_dir, 'v1', 'main.py'))
+    import main
+    from atlas import TileAtlas
+
+    # 两个渲染器使用同一个随机局面：一部分单元格已揭示
+    board = make_board(size, size, DENSITY)
+    board.state[:] = random_mines(size, size, revealed, seed=1)
+    v1.ROWS = v1.COLS = size
+    v1.CELL_SIZE = cell_size
+    v1.board = [[engine.Cell('mine' if board.mines[r, c] else f'number_{board.adjacent[r, c]}',
+                             'revealed' if board.state[r, c] else 'covered')
+                 for c in range(size)] for r in range(size)]
+    main.board = board
+    main.CELL_SIZE = cell_size
+    main.atlas = TileAtlas(cell_size)
+
+    screen = pygame.Surface((size * cell_size, size * cell_size)).convert()
+    for name, func in [('v1 legacy', lambda: legacy_v1_draw(v1, screen)),
+                       ('v1 tiles', lambda: v1.draw_board(screen)),
+                       ('main atlas', lambda: main.draw_board(screen))]:
+        elapsed, _ = timeit(func)
+        print(f'{name:>10}: {elapsed * 1e3:>8.2f}ms per frame')
+
+
+def bench_chunked(density, clicks, spread):
+    """在无边界游戏板上随机揭示单元格，报告已生成区块的内存和与同等范围的完整游戏板的对比。"""
+    import chunked
+    board = chunked.ChunkedBoard(density, seed=0)
+    rng = random.Random(0)
+    print(f'{"clicks":>7} {"revealed":>10} {"chunks":>7} {"memory":>10} {"dense":>10} {"time":>10}')
+    done = 0
+    start = time.perf_counter()
+    for target in clicks:
+        while done < target:
+            row, col = rng.randrange(-spread, spread), rng.randrange(-spread, spread)
+            chunked.reveal_cell(board, row, col)
+            board.game_state = 'playing'  # 踩雷也继续探索
+            done += 1
+        elapsed = time.perf_counter() - start
+        # 覆盖所有已生成区块的完整游戏板（地雷、相邻数、状态各一个字节）需要的内存
+        rows = [cr for cr, _ in board.chunks]
+        cols = [cc for _, cc in board.chunks]
+        span = (max(rows) - min(rows) + 1) * (max(cols) - min(cols) + 1) * board.chunk_size ** 2
+        print(f'{done:>7} {board.revealed_safe:>10} {len(board.chunks):>7} '
+              f'{board.memory_bytes() / 2 ** 20:>8.1f}MB {span * 3 / 2 ** 20:>8.1f}MB {elapsed * 1e3:>8.1f}ms')
+
+
+def bench_solver(size, density, clicks):
+    """按提示连续揭示安全单元格，比较每次点击后的增量更新与从头建立提示引擎的耗时。"""
+    from solver import Solver
+    board = engine.create_board(size, size, int(size * size * density), seed=0)
+    engine.click(board, size // 2, size // 2, engine.LEFT)
+    solver = Solver(board)
+    updates, queries = [], []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        safe, _ = solver.hints()
+        queries.append(time.perf_counter() - start)
+        if not safe:  # 没有能推导出的安全单元格
+            break
+        changed = engine.click(board, *safe[0], engine.LEFT)
+        start = time.perf_counter()
+        solver.update(changed)
+        updates.append(time.perf_counter() - start)
+    rebuild, _ = timeit(lambda: Solver(board))
+    print(f'{size}x{size}, {len(updates)} clicks, {board.revealed_safe} revealed')
+    print(f'incremental update: {sum(updates) / len(updates) * 1e3:.3f}ms mean, {max(updates) * 1e3:.3f}ms max')
+    print(f'hint query:         {sum(queries) / len(queries) * 1e3:.3f}ms mean, {max(queries) * 1e3:.3f}ms max')
+    print(f'full rebuild:       {rebuild * 1e3:.3f}ms')
+
+
+def bench_probability(games, rows, cols, num_mines):
+    """按最低概率逐步下完若干局，比较有无分量缓存时每一步计算概率的耗时。"""
+    from probability import ProbabilityEngine, ComponentCache
+    for name, size in [('no cache', 0), ('cached', 4096)]:
+        cache = ComponentCache(size)
+        moves = 0
+        start = time.perf_counter()
+        for seed in range(games):
+            board = engine.create_board(rows, cols, num_mines, seed=seed)
+            probabilities = ProbabilityEngine(board, cache=cache)
+            probabilities.update(engine.click(board, rows // 2, cols // 2, engine.LEFT))
+            while board.game_state == 'playing':
+                p = probabilities.probabilities()
+                p[board.state == engine.REVEALED] = 2  # 只在未揭示的单元格中选
+                row, col = np.unravel_index(p.argmin(), p.shape)
+                probabilities.update(engine.click(board, row, col, engine.LEFT))
+                moves += 1
+        elapsed = time.perf_counter() - start
+        print(f'{name:>8}: {moves} moves, {elapsed / moves * 1e3:.3f}ms per move, '
+              f'{cache.hits} hits, {cache.misses} misses')
+
+
+def bench_bitboard(sizes, density, repeat=5):
+    """在 size x size 的游戏板上比较位棋盘引擎、NumPy 引擎和原先 Cell 列表的生成、连锁揭示和胜利检查。"""
+    import bitboard
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(sizes) ** 2))  # 原先的递归连锁揭示
+    print(f'{"size":>11} {"engine":>9} {"generate":>10} {"cascade":>10} {"win check":>10}')
+    for size in sizes:
+        num_mines = int(size * size * density)
+        row = col = size // 2  # 第一次点击：周围没有地雷，是空单元格
+
+        def legacy_generate():
+            board = legacy_place_mines(size, size, num_mines)
+            legacy_number_cells(board)
+            return board
+
+        def numpy_generate():
+            board = engine.create_board(size, size, num_mines, seed=0)
+            engine.place_mines(board, row, col)
+            return board
+
+        def bit_generate():
+            board = bitboard.create_board(size, size, num_mines, seed=0)
+            bitboard.place_mines(board, row, col)
+            return board
+
+        def legacy_copy():
+            # 与另外两个引擎使用同一个布局（它们的抽样方式相同）
+            layout = numpy_generate()
+            return [[engine.Cell('mine' if m else f'number_{n}', 'covered') for m, n in zip(mr, nr)]
+                    for mr, nr in zip(layout.mines.tolist(), layout.adjacent.tolist())]
+
+        total = size * size - num_mines
+        for name, generate, fresh, cascade, win in [
+            ('legacy', legacy_generate, legacy_copy, lambda b: legacy_reveal_empty_cells(b, row, col),
+             lambda b: legacy_check_win(b, total)),
+            ('numpy', numpy_generate, numpy_generate, lambda b: engine.reveal_empty_cells(b, row, col),
+             engine.check_win_loss),
+            ('bitboard', bit_generate, bit_generate, lambda b: bitboard.reveal_empty_cells(b, row, col),
+             bitboard.check_win_loss),
+        ]:
+            gen_time, _ = timeit(generate, repeat)
+            boards = [fresh() for _ in range(repeat)]  # 每次连锁揭示都从全覆盖的游戏板开始
+            cascade_time = min(timeit(lambda: cascade(board), 1)[0] for board in boards)
+            win_time, _ = timeit(lambda: win(boards[0]), repeat)
+            print(f'{size:>5}x{size:<5} {name:>9} {gen_time * 1e6:>8.0f}us '
+                  f'{cascade_time * 1e6:>8.0f}us {win_time * 1e6:>8.1f}us')
+
+
+def click_sequence(rows, cols, num_mines, seed, length):
+    """生成一局中的点击序列 [(row, col, button)]：先点中央，再按提示插旗和揭示，推导不出时揭示一个安全单元格。
+
+    序列不会结束对局，重放时不会触发胜负处理和保存录像。
+    """
+    from solver import Solver
+    board = engine.create_board(rows, cols, num_mines, seed)  # 与 main.create_board(seed) 相同的游戏板
+    solver = Solver(board)
+    rng = random.Random(seed)
+    clicks = []
+    row, col, button = rows // 2, cols // 2, engine.LEFT
+    while len(clicks) < length:
+        changed = engine.click(board, row, col, button)
+        if board.game_state != 'playing':  # 不把结束对局的点击放进序列
+            break
+        clicks.append((row, col, button))
+        solver.update(changed)
+        safe, mines = solver.hints()
+        if mines:  # 插旗
+            (row, col), button = mines[0], engine.RIGHT
+        elif safe:  # 揭示推导出的安全单元格
+            (row, col), button = safe[0], engine.LEFT
+        else:  # 推导不出时直接挑一个安全单元格，保证序列能继续
+            candidates = np.flatnonzero((board.state == engine.COVERED) & ~board.mines)
+            row, col = divmod(int(candidates[rng.randrange(len(candidates))]), cols)
+            button = engine.LEFT
+    return clicks
+
+
+def run_suite(sizes, densities, length=SEQUENCE_LENGTH):
+    """对 main.py 的 create_board、reveal_empty_cells、check_win_loss、handle_click 序列和 draw_board 计时。
+
+    返回 {名称/边长/密度: 秒}。渲染使用 SDL 的虚拟视频驱动。
+    """
+    init_display(300, 300)  # main 在导入时创建窗口
+    import main
+
+    # 基准会修改 main 的模块全局变量，结束后恢复
+    saved = {name: getattr(main, name) for name in
+             ('ROWS', 'COLS', 'NUM_MINES', 'CELL_SIZE', 'atlas', 'board', 'solver', 'recorder')}
+    try:
+        return _run_suite(main, sizes, densities, length)
+    finally:
+        for name, value in saved.items():
+            setattr(main, name, value)
+
+
+def _run_suite(main, sizes, densities, length):
+    """run_suite 的主体，main 的全局变量由调用者恢复。"""
+    import pygame
+    from atlas import TileAtlas
+
+    results = {}
+    for size in sizes:
+        repeat = 5 if size <= 500 else 3
+        # 渲染的画布不超过 2000x2000 像素，大游戏板用更小的单元格
+        cell_size = max(1, min(30, 2000 // size))
+        main.CELL_SIZE = cell_size
+        main.atlas = TileAtlas(cell_size)
+        screen = pygame.Surface((size * cell_size, size * cell_size)).convert()
+        for density in densities:
+            num_mines = int(size * size * density)
+            main.ROWS = main.COLS = size
+            main.NUM_MINES = num_mines
+            center = size // 2
+            key = f'{size}x{size}/{density}'
+
+            def create():
+                main.create_board(0)
+                engine.place_mines(main.board, center, center)  # 第一次点击时放置地雷
+            results[f'create_board/{key}'], _ = timeit(create, repeat)
+            board = main.board
+
+            def cascade():
+                board.state[:] = engine.COVERED  # 每次都从全覆盖开始
+                board.revealed_safe = 0
+                return engine.reveal_empty_cells(board, center, center)  # 中央周围没有地雷，是空单元格
+            results[f'reveal_empty_cells/{key}'], _ = timeit(cascade, repeat)
+            results[f'check_win_loss/{key}'], _ = timeit(lambda: engine.check_win_loss(board), repeat)
+
+            clicks = click_sequence(size, size, num_mines, 0, length)
+            best = float('inf')
+            for _ in range(repeat):
+                main.create_board(0)
+                changed = set()  # 整个点击序列中变化过的单元格
+                start = time.perf_counter()
+                for row, col, button in clicks:
+                    changed.update(main.handle_click(col * cell_size, row * cell_size, button))
+                best = min(best, time.perf_counter() - start)
+            results[f'handle_click_x{len(clicks)}/{key}'] = best
+
+            # 在 handle_click 序列下到一半的局面上绘制：整个游戏板，以及序列中变化过的所有单元格
+            changed = list(changed)
+            results[f'draw_board/{key}'], _ = timeit(lambda: main.draw_board(screen), repeat)
+            results[f'draw_board_cells/{key}'], _ = timeit(lambda: main.draw_board(screen, changed), repeat)
+            print(f'{key:>16}: ' + '  '.join(f'{name.split("/")[0]} {value * 1e3:.2f}ms'
+                                             for name, value in results.items() if name.endswith(key)), flush=True)
+    return results
+
+
+def bench_suite(sizes, densities, out, thresholds_path, update_thresholds, margin):
+    """运行完整基准，保存 JSON 结果并与回归阈值比较；有回归时以状态码1退出。"""
+    import pygame
+    results = run_suite(sizes, densities)
+    with open(out, 'w') as f:
+        json.dump({'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                                   'pygame': pygame.version.ver, 'platform': platform.platform(),
+                                   'date': time.strftime('%Y-%m-%d %H:%M:%S')},
+                   'results': results}, f, indent=2)
+    print(f'results saved to {out}')
+
+    if update_thresholds:  # 以本次结果乘以余量作为新的阈值
+        with open(thresholds_path, 'w') as f:
+            json.dump({name: round(max(value * margin, value + THRESHOLD_FLOOR), 6)
+                       for name, value in results.items()}, f, indent=2)
+        print(f'thresholds saved to {thresholds_path}')
+        return
+    if not os.path.exists(thresholds_path):
+        print('no thresholds file, run with --update-thresholds to create one')
+        return
+    with open(thresholds_path) as f:
+        thresholds = json.load(f)
+    regressions = [(name, value, thresholds[name]) for name, value in results.items()
+                   if name in thresholds and value > thresholds[name]]
+    for name, value, limit in regressions:
+        print(f'REGRESSION {name}: {value * 1e3:.2f}ms > {limit * 1e3:.2f}ms')
+    print(f'{len(results) - len(regressions)}/{len(results)} within thresholds')
+    if regressions:
+        sys.exit(1)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='扫雷引擎性能基准测试')
+    sub = parser.add_subparsers(dest='bench', required=True)
+
+    p = sub.add_parser('adjacent', help='相邻地雷计数')
+    p.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='游戏板边长')
+    p.add_argument('--legacy-max', type=int, default=500, help='旧实现参与对比的最大边长')
+
+    p = sub.add_parser('cascade', help='空白区域连锁揭示')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500, 1000, 2000], help='游戏板边长')
+    p.add_argument('--density', type=float, default=0.01, help='地雷密度')
+
+    p = sub.add_parser('mines', help='地雷放置')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='游戏板边长')
+    p.add_argument('--densities', type=float, nargs='+', default=[0.1, 0.3, 0.5, 0.7, 0.9], help='地雷密度')
+    p.add_argument('--legacy-max', type=int, default=1000, help='旧实现参与对比的最大边长')
+
+    p = sub.add_parser('save', help='二进制存档')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 4000], help='游戏板边长')
+    p.add_argument('--density', type=float, default=DENSITY, help='地雷密度')
+    p.add_argument('--legacy-max', type=int, default=500, help='参与 pickle 体积对比的最大边长')
+
+    p = sub.add_parser('import', help='导入 engine 的耗时')
+    p.add_argument('--repeat', type=int, default=10, help='重复次数')
+
+    p = sub.add_parser('atlas', help='图块图集')
+    p.add_argument('--cell-size', type=int, default=30, help='单元格大小')
+    p.add_argument('--count', type=int, default=100000, help='每轮 blit 的图块数')
+
+    p = sub.add_parser('text', help='文字缓存')
+    p.add_argument('--count', type=int, default=2000, help='每轮渲染的文字数')
+
+    p = sub.add_parser('v1render', help='v1 程序化渲染')
+    p.add_argument('--size', type=int, default=200, help='游戏板边长')
+    p.add_argument('--cell-size', type=int, default=10, help='单元格大小')
+    p.add_argument('--revealed', type=float, default=0.5, help='已揭示单元格的比例')
+
+    p = sub.add_parser('chunked', help='懒加载的超大游戏板')
+    p.add_argument('--density', type=float, default=0.2, help='地雷密度')
+    p.add_argument('--clicks', type=int, nargs='+', default=[1, 10, 100, 1000], help='累计点击次数')
+    p.add_argument('--spread', type=int, default=100000, help='点击坐标的范围 [-spread, spread)')
+
+    p = sub.add_parser('solver', help='提示引擎')
+    p.add_argument('--size', type=int, default=1000, help='游戏板边长')
+    p.add_argument('--density', type=float, default=DENSITY, help='地雷密度')
+    p.add_argument('--clicks', type=int, default=500, help='按提示点击的次数')
+
+    p = sub.add_parser('probability', help='地雷概率')
+    p.add_argument('--games', type=int, default=50, help='对局数')
+    p.add_argument('--rows', type=int, default=16, help='行数')
+    p.add_argument('--cols', type=int, default=30, help='列数')
+    p.add_argument('--mines', type=int, default=99, help='地雷数')
+
+    p = sub.add_parser('bitboard', help='位棋盘引擎')
+    p.add_argument('--sizes', type=int, nargs='+', default=[9, 16, 30, 50], help='游戏板边长')
+    p.add_argument('--density', type=float, default=DENSITY, help='地雷密度')
+
+    p = sub.add_parser('suite', help='完整基准，保存 JSON 结果并检查回归阈值')
+    p.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES, help='游戏板边长')
+    p.add_argument('--densities', type=float, nargs='+', default=SUITE_DENSITIES, help='地雷密度')
+    p.add_argument('--out', default=RESULTS_PATH, help='结果 JSON 的路径')
+    p.add_argument('--thresholds', default=THRESHOLDS_PATH, help='回归阈值 JSON 的路径')
+    p.add_argument('--update-thresholds', action='store_true', help='用本次结果更新阈值')
+    p.add_argument('--margin', type=float, default=THRESHOLD_MARGIN, help='更新阈值时的余量倍数')
+
+    args = parser.parse_args()
+    random.seed(0)
+    if args.bench == 'adjacent':
+        bench_adjacent(args.sizes, args.legacy_max)
+    elif args.bench == 'cascade':
+        bench_cascade(args.sizes, args.density)
+    elif args.bench == 'mines':
+        bench_mines(args.sizes, args.densities, args.legacy_max)
+    elif args.bench == 'save':
+        bench_save(args.sizes, args.density, args.legacy_max)
+    elif args.bench == 'import':
+        bench_import(args.repeat)
+    elif args.bench == 'atlas':
+        bench_atlas(args.cell_size, args.count)
+    elif args.bench == 'text':
+        bench_text(args.count)
+    elif args.bench == 'v1render':
+        bench_v1render(args.size, args.cell_size, args.revealed)
+    elif args.bench == 'chunked':
+        bench_chunked(args.density, args.clicks, args.spread)
+    elif args.bench == 'solver':
+        bench_solver(args.size, args.density, args.clicks)
+    elif args.bench == 'probability':
+        bench_probability(args.games, args.rows, args.cols, args.mines)
+    elif args.bench == 'bitboard':
+        bench_bitboard(args.sizes, args.density)
+    elif args.bench == 'suite':
+        bench_suite(args.sizes, args.densities, args.out, args.thresholds, args.update_thresholds, args.margin)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,308 @@
+"""
+位棋盘扫雷引擎：用 Python 大整数存储地雷、已揭示、旗帜和问号，适合几千个单元格以内的游戏板。
+
+单元格 (row, col) 对应第 row * cols + col 位。整块游戏板的操作都是大整数的移位和按位运算：
+
+- 相邻地雷数：把地雷位棋盘向8个方向移位（用边缘掩码去掉跨行回绕的位），
+  再用按位加法器累加成4个位平面（每个单元格的计数 0-8 占4位）；
+- 连锁揭示：从点击的空单元格出发，反复向8个方向膨胀并与“被覆盖的空单元格”位棋盘相与，直到不再变化；
+- 胜负检查：比较“非地雷”和“已揭示”两个位棋盘；
+- 连开：相邻旗帜数是把单元格膨胀一格后与旗帜位棋盘相与的位数。
+
+函数名和 Board 的属性与 engine 模块一致（create_board、click、reveal_cell、cycle_flag、chord、
+reveal_empty_cells、check_win_loss、Board.cell()），相同的种子和第一次点击得到相同的地雷布局，
+相同的点击序列得到相同的结果（用 verify 对照检查）。
+
+运行方式：
+    python bitboard.py --verify   # 用随机对局逐次点击与 engine 对照
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import random  # 用于生成对照检查的随机点击
+
+import engine
+from engine import Cell, COVERED, REVEALED, FLAGGED, UNKNOWN, LEFT, MIDDLE, RIGHT, SAFE_NEIGHBOURHOOD, make_rng
+
+
+class BitBoard:
+    """用大整数位棋盘存储的游戏板。"""
+
+    def __init__(self, rows, cols, num_mines=0, rng=None):
+        self.rows = rows  # 行数
+        self.cols = cols  # 列数
+        self.num_mines = num_mines  # 地雷的数量
+        self.rng = make_rng(rng)  # 放置地雷用的随机数生成器
+        self.full = (1 << rows * cols) - 1  # 所有单元格
+        # 边缘掩码：去掉第0列或最后一列，防止水平移位时跨行回绕
+        first_col = sum(1 << r * cols for r in range(rows))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << cols - 1)
+        self.mines = 0  # 地雷
+        self.revealed = 0  # 已揭示
+        self.flagged = 0  # 旗帜
+        self.unknown = 0  # 问号
+        self.planes = (0, 0, 0, 0)  # 相邻地雷数的4个位平面（第 i 个平面是计数的第 i 位）
+        self.zero = 0  # 相邻地雷数为0的非地雷单元格
+        self.dead = None  # 踩中的地雷位置 (row, col)，没有则为 None
+        self.mines_placed = False  # 地雷是否已放置（第一次揭示时才放置）
+        self.game_state = 'playing'  # 游戏状态：'playing'（游戏中）, 'won'（胜利）, 'lost'（失败）
+
+    @property
+    def total_non_mines(self):
+        """非地雷单元格的总数。"""
+        return self.rows * self.cols - self.num_mines
+
+    @property
+    def covered(self):
+        """被覆盖且没有标记的单元格。"""
+        return self.full & ~(self.revealed | self.flagged | self.unknown)
+
+    @property
+    def revealed_safe(self):
+        """已揭示的非地雷单元格数。"""
+        return (self.revealed & ~self.mines).bit_count()
+
+    def bit(self, row, col):
+        """(row, col) 对应的位。"""
+        return 1 << row * self.cols + col
+
+    def state(self, row, col):
+        """(row, col) 的状态编码，与 engine 的 Board.state 相同。"""
+        bit = self.bit(row, col)
+        if self.revealed & bit:
+            return REVEALED
+        if self.flagged & bit:
+            return FLAGGED
+        if self.unknown & bit:
+            return UNKNOWN
+        return COVERED
+
+    def adjacent(self, row, col):
+        """(row, col) 周围的地雷数，从4个位平面中取出。"""
+        index = row * self.cols + col
+        return sum((plane >> index & 1) << i for i, plane in enumerate(self.planes))
+
+    def cell(self, row, col):
+        """以字符串形式返回 (row, col) 处的单元格，与 engine 的 Board.cell() 相同。"""
+        state = self.state(row, col)
+        if state == FLAGGED:
+            return Cell('flag', 'flagged')
+        if state == UNKNOWN:
+            return Cell('unk', 'flagged')
+        if self.mines & self.bit(row, col):
+            value = 'dead' if self.dead == (row, col) else 'mine'
+        else:
+            value = f'number_{self.adjacent(row, col)}'
+        return Cell(value, 'revealed' if state == REVEALED else 'covered')
+
+    # --- 位棋盘运算 ---
+
+    def shifts(self, bits):
+        """返回 bits 向8个方向各移动一格的结果：每个单元格得到它的一个邻居的位。"""
+        cols, full = self.cols, self.full
+        east = (bits << 1) & self.not_first_col  # 左边的邻居
+        west = (bits >> 1) & self.not_last_col  # 右边的邻居
+        rows = (bits, east, west)
+        return ([(b << cols) & full for b in rows] +  # 上一行的三个邻居
+                [(b >> cols) for b in rows] +  # 下一行的三个邻居
+                [east, west])
+
+    def dilate(self, bits):
+        """把 bits 向8个方向各膨胀一格（包含自身）。"""
+        result = bits
+        for shifted in self.shifts(bits):
+            result |= shifted
+        return result
+
+
+# --- 游戏函数 ---
+
+def create_board(rows, cols, num_mines, seed=None):
+    """创建并初始化游戏板。地雷推迟到第一次揭示时由 place_mines 放置。"""
+    if num_mines >= rows * cols:
+        raise ValueError(f'too many mines ({num_mines}) for a {rows}x{cols} board')
+    return BitBoard(rows, cols, num_mines, seed)
+
+def place_mines(board, safe_row, safe_col, safe_neighbourhood=SAFE_NEIGHBOURHOOD):
+    """放置地雷，抽样方式与 engine.place_mines 相同，相同的种子得到相同的布局。"""
+    rows, cols, num_mines = board.rows, board.cols, board.num_mines
+    excluded = [safe_row * cols + safe_col]  # 不能放雷的格子（位序号）
+    if safe_neighbourhood:
+        neighbours = [r * cols + c
+                      for r in range(max(safe_row - 1, 0), min(safe_row + 2, rows))
+                      for c in range(max(safe_col - 1, 0), min(safe_col + 2, cols))]
+        if rows * cols - len(neighbours) >= num_mines:  # 地雷太多时只保证点击的格子安全
+            excluded = neighbours
+    available = rows * cols - len(excluded)  # 可以放雷的格子数
+    if num_mines > available:
+        raise ValueError(f'cannot place {num_mines} mines on a {rows}x{cols} board with a safe first click')
+
+    # 先在去掉被排除格子的压缩序号上置位，再在被排除的位置插入0位，映射回真实位序号
+    picked = bytearray(-(-available // 8))
+    for pick in board.rng.sample(range(available), num_mines):
+        picked[pick >> 3] |= 1 << (pick & 7)
+    mines = int.from_bytes(picked, 'little')
+    for index in sorted(excluded):
+        low = mines & ((1 << index) - 1)
+        mines = low | (mines >> index << index + 1)
+    board.mines = mines
+    board.mines_placed = True
+    board.planes = count_adjacent_mines(board)
+    board.zero = board.full & ~mines & ~(board.planes[0] | board.planes[1] | board.planes[2] | board.planes[3])
+
+def count_adjacent_mines(board):
+    """用移位和按位加法器计算每个单元格周围的地雷数，返回4个位平面。"""
+    planes = [0, 0, 0, 0]
+    for shifted in board.shifts(board.mines):
+        carry = shifted
+        for i in range(4):  # 把这个方向的0/1逐位加到计数上
+            planes[i], carry = planes[i] ^ carry, planes[i] & carry
+    return tuple(planes)
+
+def click(board, row, col, button):
+    """处理对 (row, col) 的一次点击，返回状态发生变化的 (row, col) 单元格列表。"""
+    if not (0 <= row < board.rows and 0 <= col < board.cols) or board.game_state != 'playing':
+        return []
+    if button == MIDDLE or (button == LEFT and board.revealed & board.bit(row, col)):  # 中键或左键点击已揭示的数字：连开
+        return chord(board, row, col)
+    if button == LEFT:  # 左键点击揭示单元格
+        return reveal_cell(board, row, col)
+    if button == RIGHT:  # 右键点击标记单元格
+        return cycle_flag(board, row, col)
+    return []
+
+def reveal_cell(board, row, col):
+    """揭示一个被覆盖的单元格：踩雷则失败，空单元格连锁揭示。返回变化的单元格列表。"""
+    bit = board.bit(row, col)
+    if not board.covered & bit:  # 已揭示或已标记的单元格不响应
+        return []
+    if not board.mines_placed:  # 第一次揭示时才放置地雷，保证第一次点击安全
+        place_mines(board, row, col)
+    if board.mines & bit:  # 如果点击到地雷
+        board.revealed |= bit
+        board.dead = (row, col)
+        board.game_state = 'lost'
+        return [(row, col)]
+    changed = reveal_empty_cells(board, row, col)
+    check_win_loss(board)  # 检查胜利或失败
+    return changed
+
+def cycle_flag(board, row, col):
+    """切换标记：覆盖 -> 旗帜 -> 问号 -> 覆盖。返回变化的单元格列表。"""
+    bit = board.bit(row, col)
+    if board.revealed & bit:  # 已揭示的单元格不能标记
+        return []
+    if board.flagged & bit:  # 旗帜 -> 问号
+        board.flagged &= ~bit
+        board.unknown |= bit
+    elif board.unknown & bit:  # 问号 -> 覆盖
+        board.unknown &= ~bit
+    else:  # 覆盖 -> 旗帜
+        board.flagged |= bit
+    return [(row, col)]
+
+def chord(board, row, col):
+    """连开：已揭示的数字周围的旗帜数等于数字时，揭示它周围所有没有标记的单元格。返回变化的单元格列表。"""
+    bit = board.bit(row, col)
+    if not board.revealed & bit or board.mines & bit:
+        return []
+    number = board.adjacent(row, col)
+    if number == 0 or (board.dilate(bit) & board.flagged).bit_count() != number:  # 空单元格或旗帜数不等于数字
+        return []
+
+    changed = []
+    # 按与 engine.chord 相同的顺序逐个揭示，踩中地雷时停在同一个单元格
+    for r in range(max(row - 1, 0), min(row + 2, board.rows)):
+        for c in range(max(col - 1, 0), min(col + 2, board.cols)):
+            if board.covered & board.bit(r, c):  # 旗帜和问号不揭示
+                changed += reveal_cell(board, r, c)
+                if board.game_state != 'playing':  # 旗帜插错踩中地雷，或者已经胜利
+                    return changed
+    return changed
+
+def reveal_empty_cells(board, row, col):
+    """揭示 (row, col)；如果是空单元格，用膨胀揭示与它连通的空白区域及其边缘，返回揭示的单元格列表。"""
+    if not (0 <= row < board.rows and 0 <= col < board.cols):
+        return []
+    bit = board.bit(row, col)
+    covered = board.covered
+    if not covered & bit:
+        return []
+
+    newly = bit
+    if board.zero & bit:
+        passable = board.zero & covered  # 连锁揭示只经过被覆盖的空单元格
+        region = bit
+        while True:  # 反复膨胀，直到空白区域不再增长
+            grown = region | (board.dilate(region) & passable)
+            if grown == region:
+                break
+            region = grown
+        newly = board.dilate(region) & covered  # 空白区域及其边缘的数字（都不是地雷）
+    board.revealed |= newly
+    return cells_of(board, newly)
+
+def cells_of(board, bits):
+    """把位棋盘转换为 (row, col) 列表。"""
+    cells = []
+    cols = board.cols
+    while bits:
+        low = bits & -bits  # 最低的一位
+        cells.append(divmod(low.bit_length() - 1, cols))
+        bits ^= low
+    return cells
+
+def check_win_loss(board):
+    """检查胜利条件：所有非地雷单元格都已揭示。"""
+    if board.game_state == 'lost':  # 如果已经失败，无需检查胜利
+        return
+    if board.full & ~board.mines & ~board.revealed == 0:
+        board.game_state = 'won'
+
+def verify(games=300, rows=9, cols=9, num_mines=10, clicks=200, seed=0):
+    """用随机对局逐次点击对照 engine：每次点击都比较变化的单元格、游戏状态和整个游戏板。
+
+    点击随机使用左键、中键和右键。返回不一致的对局数。
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    for game in range(games):
+        game_seed = rng.getrandbits(63)
+        reference = engine.create_board(rows, cols, num_mines, game_seed)
+        board = create_board(rows, cols, num_mines, game_seed)
+        for _ in range(clicks):
+            row, col = rng.randrange(rows), rng.randrange(cols)
+            button = rng.choice((LEFT, MIDDLE, RIGHT))
+            expected = engine.click(reference, row, col, button)
+            changed = click(board, row, col, button)
+            if (sorted(map(tuple, expected)) != sorted(changed) or board.game_state != reference.game_state or
+                    any(board.cell(r, c) != reference.cell(r, c) for r in range(rows) for c in range(cols))):
+                mismatches += 1
+                break
+            if board.game_state != 'playing':
+                break
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='位棋盘扫雷引擎')
+    parser.add_argument('--verify', action='store_true', help='用随机对局逐次点击与 engine 对照')
+    parser.add_argument('--games', type=int, default=300, help='对照的对局数')
+    parser.add_argument('--rows', type=int, default=9, help='行数')
+    parser.add_argument('--cols', type=int, default=9, help='列数')
+    parser.add_argument('--mines', type=int, default=10, help='地雷数')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    args = parser.parse_args()
+
+    if args.verify:
+        mismatches = verify(args.games, args.rows, args.cols, args.mines, seed=args.seed)
+        print(f'{args.games - mismatches}/{args.games} games match engine')
+        if mismatches:
+            raise SystemExit(1)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()  # 调用主函数
@@ -0,0 +1,280 @@
+"""
+超大（或无边界）扫雷游戏板：按固定大小的区块懒加载。
+
+- 区块在第一次被访问时才由 (种子, 区块坐标) 确定性地生成，相同种子总是得到相同的游戏板；
+- 相邻地雷数在区块里第一次揭示单元格时才计算；
+- 内存占用与已探索的区域成正比，而不是与整个游戏板的面积成正比；
+- 有边界的游戏板揭示完所有非地雷单元格即胜利：已生成区块的非地雷单元格数增量维护，
+  只有在它们都已揭示时才检查还没生成的区块（找到一个有非地雷单元格的区块就停止，不保存它）。
+
+与 engine 模块一样不依赖 pygame，pygame 前端见 huge.py。
+"""
+
+# 导入必要的库
+import random  # 用于在没有给出种子时随机选一个
+
+import numpy as np  # 用于存储区块数据和生成地雷
+
+from engine import COVERED, REVEALED, FLAGGED, UNKNOWN, LEFT, MIDDLE, RIGHT, count_adjacent_mines
+
+CHUNK_SIZE = 64  # 区块边长（单元格数）
+MIN_UNBOUNDED_DENSITY = 0.1  # 无边界游戏板的最低地雷密度，更低时空白区域可能无限连通
+
+
+def _zigzag(n):
+    """把可能为负的区块坐标映射成非负整数，用作随机数种子。"""
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+class Chunk:
+    """一个区块：地雷、状态和（懒计算的）相邻地雷数。"""
+
+    __slots__ = ('mines', 'state', 'adjacent', 'flag_counts')
+
+    def __init__(self, mines):
+        self.mines = mines  # 地雷掩码
+        self.state = np.zeros(mines.shape, dtype=np.uint8)  # 单元格状态编码
+        self.flag_counts = np.zeros(mines.shape, dtype=np.uint8)  # 相邻旗帜数，插旗和拔旗时增量维护
+        self.adjacent = None  # 相邻地雷数，第一次揭示时才计算
+
+
+class ChunkedBoard:
+    """按区块懒生成的游戏板。rows/cols 为 None 时在该方向上没有边界，坐标可以为负。"""
+
+    def __init__(self, density, seed=None, rows=None, cols=None, chunk_size=CHUNK_SIZE):
+        if not 0 < density < 1:
+            raise ValueError('density must be between 0 and 1')
+        if (rows is None or cols is None) and density < MIN_UNBOUNDED_DENSITY:
+            raise ValueError(f'unbounded boards need a mine density of at least {MIN_UNBOUNDED_DENSITY}')
+        self.density = density  # 地雷密度
+        self.seed = random.randrange(2 ** 63) if seed is None else seed  # 生成区块用的种子
+        self.rows = rows  # 行数，None 表示无边界
+        self.cols = cols  # 列数，None 表示无边界
+        self.chunk_size = chunk_size  # 区块边长
+        self.chunks = {}  # (区块行, 区块列) -> Chunk
+        self.safe_zone = None  # 第一次揭示时点击的位置，其周围 3x3 不放地雷
+        self.dead = None  # 踩中的地雷位置 (row, col)
+        self.revealed_safe = 0  # 已揭示的非地雷单元格数
+        self.safe_cells = 0  # 已生成区块中边界内的非地雷单元格数，用于判断有边界游戏板的胜利
+        self.game_state = 'playing'  # 游戏状态：'playing'（游戏中）, 'won'（胜利，仅有边界时）, 'lost'（失败）
+
+    # --- 区块管理 ---
+
+    @property
+    def bounded(self):
+        """游戏板在两个方向上是否都有边界（只有这时才能胜利）。"""
+        return self.rows is not None and self.cols is not None
+
+    def in_bounds(self, row, col):
+        """(row, col) 是否在游戏板内。"""
+        return ((self.rows is None or 0 <= row < self.rows) and
+                (self.cols is None or 0 <= col < self.cols))
+
+    def peek(self, row, col):
+        """返回 (row, col) 所在的区块和区块内坐标；区块还没生成时返回 (None, r, c)，不会生成它。"""
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        return self.chunks.get((cr, cc)), r, c
+
+    def chunk(self, cr, cc):
+        """返回区块 (cr, cc)，第一次访问时生成。"""
+        chunk = self.chunks.get((cr, cc))
+        if chunk is None:
+            chunk = self.chunks[(cr, cc)] = Chunk(self._generate_mines(cr, cc))
+            self.safe_cells += self._area(cr, cc) - int(np.count_nonzero(chunk.mines))
+        return chunk
+
+    def _area(self, cr, cc):
+        """区块 (cr, cc) 中落在游戏板边界内的单元格数。"""
+        size = self.chunk_size
+        top, left = cr * size, cc * size
+        height = size if self.rows is None else max(0, min(top + size, self.rows) - max(top, 0))
+        width = size if self.cols is None else max(0, min(left + size, self.cols) - max(left, 0))
+        return height * width
+
+    def _generate_mines(self, cr, cc):
+        """由种子和区块坐标确定性地生成区块 (cr, cc) 的地雷。"""
+        size = self.chunk_size
+        rng = np.random.default_rng([self.seed, _zigzag(cr), _zigzag(cc)])
+        mines = rng.random((size, size)) < self.density
+        top, left = cr * size, cc * size  # 区块左上角的全局坐标
+        # 游戏板边界以外没有地雷
+        if self.rows is not None:
+            mines[max(0, min(size, self.rows - top)):] = False
+            mines[:max(0, -top)] = False
+        if self.cols is not None:
+            mines[:, max(0, min(size, self.cols - left)):] = False
+            mines[:, :max(0, -left)] = False
+        self._clear_safe_zone(mines, top, left)
+        return mines
+
+    def _clear_safe_zone(self, mines, top, left):
+        """清除区块中落在第一次点击安全区内的地雷，返回清除的地雷数。"""
+        if self.safe_zone is None:
+            return 0
+        row, col = self.safe_zone
+        size = self.chunk_size
+        r0, r1 = max(row - 1 - top, 0), min(row + 2 - top, size)
+        c0, c1 = max(col - 1 - left, 0), min(col + 2 - left, size)
+        if r0 >= r1 or c0 >= c1:
+            return 0
+        cleared = int(np.count_nonzero(mines[r0:r1, c0:c1]))
+        mines[r0:r1, c0:c1] = False
+        return cleared
+
+    def _compute_adjacent(self, cr, cc):
+        """计算区块 (cr, cc) 的相邻地雷数，需要周围8个区块的地雷（按需生成）。"""
+        size = self.chunk_size
+        padded = np.zeros((size + 2, size + 2), dtype=bool)  # 四周多一圈，来自相邻区块
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                mines = self.chunk(cr + dr, cc + dc).mines
+                # 相邻区块中紧贴本区块的那一行/列（或角上的一个单元格）
+                src_r = slice(0, size) if dr == 0 else (slice(size - 1, size) if dr < 0 else slice(0, 1))
+                src_c = slice(0, size) if dc == 0 else (slice(size - 1, size) if dc < 0 else slice(0, 1))
+                dst_r = slice(1, size + 1) if dr == 0 else (slice(0, 1) if dr < 0 else slice(size + 1, size + 2))
+                dst_c = slice(1, size + 1) if dc == 0 else (slice(0, 1) if dc < 0 else slice(size + 1, size + 2))
+                padded[dst_r, dst_c] = mines[src_r, src_c]
+        # 与 engine 使用同一个平移求和；最外一圈缺少更远的邻居，计数不完整，裁掉
+        return count_adjacent_mines(padded)[1:-1, 1:-1]
+
+    def locate(self, row, col):
+        """返回 (row, col) 所在的区块（已计算相邻地雷数）和区块内坐标，必要时生成区块。"""
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        chunk = self.chunk(cr, cc)
+        if chunk.adjacent is None:
+            chunk.adjacent = self._compute_adjacent(cr, cc)
+        return chunk, r, c
+
+    def all_safe_revealed(self):
+        """有边界的游戏板上所有非地雷单元格是否都已揭示。"""
+        if not self.bounded or self.revealed_safe != self.safe_cells:
+            return False
+        # 已生成的区块都揭示完了，还要确认没生成的区块里没有非地雷单元格（通常第一个就能确定）
+        size = self.chunk_size
+        for cr in range(-(-self.rows // size)):
+            for cc in range(-(-self.cols // size)):
+                if (cr, cc) not in self.chunks and self._area(cr, cc) > np.count_nonzero(self._generate_mines(cr, cc)):
+                    return False
+        return True
+
+    def memory_bytes(self):
+        """已生成区块占用的数组内存（字节）。"""
+        total = 0
+        for chunk in self.chunks.values():
+            total += chunk.mines.nbytes + chunk.state.nbytes + chunk.flag_counts.nbytes
+            if chunk.adjacent is not None:
+                total += chunk.adjacent.nbytes
+        return total
+
+
+# --- 游戏函数 ---
+
+def click(board, row, col, button):
+    """处理对 (row, col) 的一次点击，返回状态发生变化的 (row, col) 单元格列表。"""
+    if not board.in_bounds(row, col) or board.game_state != 'playing':
+        return []
+    size = board.chunk_size
+    chunk = board.chunks.get((row // size, col // size))
+    if button == MIDDLE or (button == LEFT and chunk is not None and
+                            chunk.state[row % size, col % size] == REVEALED):  # 连开
+        return chord(board, row, col)
+    if button == LEFT:  # 左键点击揭示单元格
+        return reveal_cell(board, row, col)
+    if button == RIGHT:  # 右键点击标记单元格
+        return cycle_flag(board, row, col)
+    return []
+
+def reveal_cell(board, row, col):
+    """揭示一个被覆盖的单元格：踩雷则失败，空单元格连锁揭示。"""
+    size = board.chunk_size
+    if board.chunk(row // size, col // size).state[row % size, col % size] != COVERED:
+        return []  # 已揭示或已标记的单元格不响应
+    if board.safe_zone is None:  # 第一次揭示：保证点击的格子及其邻居没有地雷
+        board.safe_zone = (row, col)
+        for (cr, cc), chunk in board.chunks.items():  # 已经生成的区块（例如插过旗）也要清除
+            board.safe_cells += board._clear_safe_zone(chunk.mines, cr * size, cc * size)
+    chunk, r, c = board.locate(row, col)  # 相邻地雷数在安全区清除之后才计算
+    if chunk.mines[r, c]:  # 如果点击到地雷
+        chunk.state[r, c] = REVEALED
+        board.dead = (row, col)
+        board.game_state = 'lost'
+        return [(row, col)]
+    changed = reveal_empty_cells(board, row, col)
+    if board.all_safe_revealed():  # 检查胜利（只有有边界的游戏板能胜利）
+        board.game_state = 'won'
+    return changed
+
+def cycle_flag(board, row, col):
+    """切换标记：覆盖 -> 旗帜 -> 问号 -> 覆盖。"""
+    size = board.chunk_size
+    chunk = board.chunk(row // size, col // size)
+    r, c = row % size, col % size
+    state = chunk.state[r, c]
+    if state == COVERED:
+        chunk.state[r, c] = FLAGGED
+        update_flag_counts(board, row, col, True)
+    elif state == FLAGGED:
+        chunk.state[r, c] = UNKNOWN
+        update_flag_counts(board, row, col, False)
+    elif state == UNKNOWN:
+        chunk.state[r, c] = COVERED
+    else:  # 已揭示的单元格不能标记
+        return []
+    return [(row, col)]
+
+def update_flag_counts(board, row, col, flagged):
+    """(row, col) 插上或拔掉旗帜后更新周围8个单元格的相邻旗帜数，邻居所在的区块必要时生成。"""
+    size = board.chunk_size
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr or dc:
+                r, c = row + dr, col + dc
+                counts = board.chunk(r // size, c // size).flag_counts
+                if flagged:
+                    counts[r % size, c % size] += 1
+                else:
+                    counts[r % size, c % size] -= 1
+
+def chord(board, row, col):
+    """连开：已揭示的数字周围的旗帜数等于数字时，揭示它周围所有没有标记的单元格。"""
+    size = board.chunk_size
+    chunk = board.chunks.get((row // size, col // size))
+    r, c = row % size, col % size
+    if chunk is None or chunk.state[r, c] != REVEALED or chunk.mines[r, c]:
+        return []
+    number = chunk.adjacent[r, c]
+    if number == 0 or chunk.flag_counts[r, c] != number:  # 空单元格或旗帜数不等于数字
+        return []
+    changed = []
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if (dr or dc) and board.in_bounds(row + dr, col + dc):
+                changed += reveal_cell(board, row + dr, col + dc)
+                if board.game_state != 'playing':  # 旗帜插错踩中地雷，或者已经胜利
+                    return changed
+    return changed
+
+def reveal_empty_cells(board, row, col):
+    """用显式栈揭示 (row, col) 以及与它连通的空白区域，跨区块进行，返回揭示的单元格列表。"""
+    revealed = []
+    stack = [(row, col)]
+    while stack:
+        row, col = stack.pop()
+        if not board.in_bounds(row, col):
+            continue
+        chunk, r, c = board.locate(row, col)
+        if chunk.state[r, c] != COVERED:  # 已揭示或已标记
+            continue
+        chunk.state[r, c] = REVEALED  # 空单元格的邻居不可能是地雷
+        revealed.append((row, col))
+        if chunk.adjacent[r, c] == 0:  # 继续扩展空单元格
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if dr or dc:
+                        stack.append((row + dr, col + dc))
+    board.revealed_safe += len(revealed)
+    return revealed
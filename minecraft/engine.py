@@ -0,0 +1,339 @@
+"""
+扫雷游戏引擎：只包含游戏规则，不依赖 pygame，可以在批处理任务和测试中直接导入。
+
+pygame 前端（main.py）只负责把像素坐标换算成格子坐标并绘制游戏板。
+"""
+
+# 导入必要的库
+import os  # 用于读取调试开关
+import random  # 用于生成随机数，放置地雷
+import struct  # 用于读写二进制存档的文件头
+from dataclasses import dataclass  # 用于创建数据类
+from typing import Literal  # 用于类型提示
+
+import numpy as np  # 用于以紧凑的整数数组存储游戏板
+
+# 定义单元格类，用于表示游戏中的每个格子（Board.cell() 返回的只读视图）
+@dataclass
+class Cell:
+    value: Literal['mine', 'dead', 'number', 'flag', 'unk']  # 单元格的值：地雷、死亡、数字、旗帜、未知
+    state: Literal['covered', 'revealed', 'flagged']  # 单元格的状态：覆盖、揭示、标记
+
+
+# 单元格状态编码，存储在 uint8 数组中
+COVERED = 0  # 覆盖
+REVEALED = 1  # 揭示
+FLAGGED = 2  # 标记为旗帜
+UNKNOWN = 3  # 标记为问号
+
+# 鼠标按钮
+LEFT = 1  # 左键：揭示（点击已满足的数字时连开）
+MIDDLE = 2  # 中键：连开
+RIGHT = 3  # 右键：标记
+
+SAFE_NEIGHBOURHOOD = True  # 第一次点击时，除了点击的格子，它周围的8个格子也不放地雷
+
+# 调试模式：每次检查胜负时用全板扫描校验增量计数器（设置环境变量 MINECRAFT_DEBUG=1 开启）
+DEBUG = os.environ.get('MINECRAFT_DEBUG') == '1'
+
+
+def make_rng(seed=None):
+    """由种子（整数、字符串等）或现成的 random.Random 实例得到随机数生成器。"""
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+class Board:
+    """用 NumPy 整数数组存储的游戏板：地雷、相邻地雷数和状态各占一个数组。"""
+
+    def __init__(self, rows, cols, num_mines=0, rng=None):
+        self.rows = rows  # 行数
+        self.cols = cols  # 列数
+        self.num_mines = num_mines  # 地雷的数量
+        self.rng = make_rng(rng)  # 放置地雷用的随机数生成器
+        self.mines = np.zeros((rows, cols), dtype=np.bool_)  # 地雷掩码，每格1字节
+        self.adjacent = np.zeros((rows, cols), dtype=np.uint8)  # 相邻地雷数（0-8）
+        self.state = np.zeros((rows, cols), dtype=np.uint8)  # 单元格状态编码
+        self.flag_counts = np.zeros((rows, cols), dtype=np.uint8)  # 相邻旗帜数，插旗和拔旗时增量维护
+        self.dead = None  # 踩中的地雷位置 (row, col)，没有则为 None
+        self.revealed_safe = 0  # 已揭示的非地雷单元格数，由揭示操作增量维护
+        self.mines_placed = False  # 地雷是否已放置（第一次揭示时才放置）
+        self.game_state = 'playing'  # 游戏状态：'playing'（游戏中）, 'won'（胜利）, 'lost'（失败）
+
+    @property
+    def total_non_mines(self):
+        """非地雷单元格的总数。"""
+        return self.rows * self.cols - self.num_mines
+
+    def cell(self, row, col):
+        """以字符串形式返回 (row, col) 处的单元格，便于调试和兼容旧代码。"""
+        state = self.state[row, col]
+        if state == FLAGGED:
+            return Cell('flag', 'flagged')
+        if state == UNKNOWN:
+            return Cell('unk', 'flagged')
+        if self.mines[row, col]:
+            value = 'dead' if self.dead == (row, col) else 'mine'
+        else:
+            value = f'number_{self.adjacent[row, col]}'
+        return Cell(value, 'revealed' if state == REVEALED else 'covered')
+
+
+# --- 游戏函数 ---
+
+def create_board(rows, cols, num_mines, seed=None):
+    """创建并初始化游戏板。地雷推迟到第一次揭示时由 place_mines 放置。
+
+    seed 可以是种子或 random.Random 实例；相同的种子和第一次点击得到相同的游戏板。
+    """
+    if num_mines >= rows * cols:
+        raise ValueError(f'too many mines ({num_mines}) for a {rows}x{cols} board')
+    return Board(rows, cols, num_mines, seed)
+
+def place_mines(board, safe_row, safe_col, safe_neighbourhood=SAFE_NEIGHBOURHOOD):
+    """在除 (safe_row, safe_col)（及其邻居）以外的格子中均匀随机地放置 board.num_mines 个地雷。
+
+    直接从可用格子的序号中无放回抽样，耗时与地雷数成正比，不受地雷密度影响。
+    """
+    rows, cols, num_mines = board.rows, board.cols, board.num_mines
+    excluded = [safe_row * cols + safe_col]  # 不能放雷的格子（一维索引）
+    if safe_neighbourhood:
+        neighbours = [r * cols + c
+                      for r in range(max(safe_row - 1, 0), min(safe_row + 2, rows))
+                      for c in range(max(safe_col - 1, 0), min(safe_col + 2, cols))]
+        if rows * cols - len(neighbours) >= num_mines:  # 地雷太多时只保证点击的格子安全
+            excluded = neighbours
+    available = rows * cols - len(excluded)  # 可以放雷的格子数
+    if num_mines > available:
+        raise ValueError(f'cannot place {num_mines} mines on a {rows}x{cols} board with a safe first click')
+
+    # 从 [0, available) 中抽样，再跳过被排除的格子映射回真实索引
+    picks = np.array(board.rng.sample(range(available), num_mines), dtype=np.int64)
+    for index in sorted(excluded):
+        picks += picks >= index
+    board.mines.reshape(-1)[picks] = True  # 放置地雷
+    board.mines_placed = True
+
+    # 计算每个单元格周围的地雷数（地雷格的计数不会被显示）
+    board.adjacent[:] = count_adjacent_mines(board.mines)
+
+def count_adjacent_mines(mines):
+    """用填充后的数组做8次平移求和，一次性算出所有单元格的相邻地雷数。"""
+    rows, cols = mines.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)  # 四周填充一圈0，省去边界检查
+    padded[1:-1, 1:-1] = mines
+    counts = np.zeros((rows, cols), dtype=np.uint8)  # 最大为8，uint8 足够
+    for dr in (0, 1, 2):  # 遍历相邻的行偏移
+        for dc in (0, 1, 2):  # 遍历相邻的列偏移
+            if dr == 1 and dc == 1:  # 跳过当前单元格
+                continue
+            counts += padded[dr:dr + rows, dc:dc + cols]  # 累加平移后的地雷掩码
+    return counts
+
+def effective_button(board, row, col, button):
+    """返回 click 对 (row, col) 实际执行的操作：左键点击已揭示的单元格等同于中键连开。"""
+    if button == LEFT and 0 <= row < board.rows and 0 <= col < board.cols and board.state[row, col] == REVEALED:
+        return MIDDLE
+    return button
+
+def click(board, row, col, button):
+    """处理对 (row, col) 的一次点击，返回状态发生变化的 (row, col) 单元格列表。"""
+    # 检查点击是否在游戏板边界内，游戏结束后不再响应
+    if not (0 <= row < board.rows and 0 <= col < board.cols) or board.game_state != 'playing':
+        return []
+    button = effective_button(board, row, col, button)
+    if button == MIDDLE:  # 中键或左键点击已揭示的数字：连开
+        return chord(board, row, col)
+    if button == LEFT:  # 左键点击揭示单元格
+        return reveal_cell(board, row, col)
+    if button == RIGHT:  # 右键点击标记单元格
+        return cycle_flag(board, row, col)
+    return []
+
+def reveal_cell(board, row, col):
+    """揭示一个被覆盖的单元格：踩雷则失败，空单元格连锁揭示。返回变化的单元格列表。"""
+    if board.state[row, col] != COVERED:  # 已揭示或已标记的单元格不响应
+        return []
+    if not board.mines_placed:  # 第一次揭示时才放置地雷，保证第一次点击安全
+        place_mines(board, row, col)
+    if board.mines[row, col]:  # 如果点击到地雷
+        board.state[row, col] = REVEALED  # 揭示单元格
+        board.dead = (row, col)  # 记录踩中的地雷
+        board.game_state = 'lost'  # 设置游戏状态为失败
+        return [(row, col)]
+    if board.adjacent[row, col] == 0:  # 如果是空单元格
+        changed = reveal_empty_cells(board, row, col)  # 揭示空单元格
+    else:  # 如果是数字单元格
+        board.state[row, col] = REVEALED  # 揭示单元格
+        board.revealed_safe += 1  # 更新已揭示的非地雷单元格数
+        changed = [(row, col)]
+    check_win_loss(board)  # 检查胜利或失败
+    return changed
+
+def cycle_flag(board, row, col):
+    """切换标记：覆盖 -> 旗帜 -> 问号 -> 覆盖。返回变化的单元格列表。"""
+    state = board.state[row, col]  # 获取当前单元格的状态
+    if state == COVERED:  # 如果单元格被覆盖
+        board.state[row, col] = FLAGGED  # 标记为旗帜
+        update_flag_counts(board, row, col, True)
+    elif state == FLAGGED:  # 如果单元格被标记为旗帜
+        board.state[row, col] = UNKNOWN  # 标记为问号
+        update_flag_counts(board, row, col, False)
+    elif state == UNKNOWN:  # 如果单元格被标记为问号
+        board.state[row, col] = COVERED  # 覆盖单元格
+    else:  # 已揭示的单元格不能标记
+        return []
+    return [(row, col)]
+
+def update_flag_counts(board, row, col, flagged):
+    """(row, col) 插上（flagged 为 True）或拔掉旗帜后更新它周围单元格的相邻旗帜数，O(1)。"""
+    neighbourhood = board.flag_counts[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+    if flagged:
+        neighbourhood += 1
+        board.flag_counts[row, col] -= 1  # 不计自身
+    else:
+        board.flag_counts[row, col] += 1  # 先补上自身，避免 uint8 下溢
+        neighbourhood -= 1
+
+def count_adjacent_flags(state):
+    """全板统计每个单元格的相邻旗帜数，用于读档和校验增量计数。"""
+    return count_adjacent_mines(state == FLAGGED)
+
+def chord(board, row, col):
+    """连开：已揭示的数字周围的旗帜数等于数字时，揭示它周围所有没有标记的单元格。
+
+    相邻旗帜数由 update_flag_counts 增量维护，判断是否满足只需 O(1)。返回变化的单元格列表。
+    """
+    if board.state[row, col] != REVEALED or board.mines[row, col]:
+        return []
+    number = board.adjacent[row, col]
+    if DEBUG:  # 调试模式下与逐格统计的结果比对
+        neighbourhood = board.state[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+        assert board.flag_counts[row, col] == np.count_nonzero(neighbourhood == FLAGGED), 'flag_counts out of sync'
+    if number == 0 or board.flag_counts[row, col] != number:  # 空单元格或旗帜数不等于数字
+        return []
+
+    changed = []
+    for r in range(max(row - 1, 0), min(row + 2, board.rows)):
+        for c in range(max(col - 1, 0), min(col + 2, board.cols)):
+            if board.state[r, c] == COVERED:  # 旗帜和问号不揭示
+                changed += reveal_cell(board, r, c)
+                if board.game_state != 'playing':  # 旗帜插错踩中地雷，或者已经胜利
+                    return changed
+    return changed
+
+def reveal_empty_cells(board, row, col):
+    """用显式栈揭示 (row, col) 所在的空白区域及其边缘的数字单元格，返回本次揭示的单元格列表。"""
+    # 检查边界和是否已经揭示或标记
+    rows, cols = board.rows, board.cols
+    if not (0 <= row < rows and 0 <= col < cols) or board.state[row, col] != COVERED:
+        return []
+
+    # 通过一维 memoryview 逐格读写，比 NumPy 标量索引快得多
+    state = memoryview(board.state).cast('B')
+    adjacent = memoryview(board.adjacent).cast('B')
+
+    start = row * cols + col  # 一维索引
+    state[start] = REVEALED  # 揭示单元格
+    revealed = [start]  # 本次揭示的单元格
+    stack = [start] if adjacent[start] == 0 else []  # 待扩展的空单元格
+
+    # 内部单元格的8个邻居在一维数组中的偏移量
+    offsets = (-cols - 1, -cols, -cols + 1, -1, 1, cols - 1, cols, cols + 1)
+    last_row = (rows - 1) * cols  # 最后一行的起始索引
+    last_col = cols - 1  # 最后一列
+
+    # 每个单元格最多入栈一次，总耗时与揭示的区域大小成正比
+    while stack:
+        index = stack.pop()
+        c = index % cols
+        if 0 < c < last_col and cols <= index < last_row:  # 内部单元格：直接用偏移量，无需边界检查
+            neighbours = [index + offset for offset in offsets]
+        else:  # 边缘单元格：按行列范围裁剪
+            r = index // cols
+            neighbours = [nr * cols + nc
+                          for nr in range(max(r - 1, 0), min(r + 2, rows))
+                          for nc in range(max(c - 1, 0), min(c + 2, cols))]
+        for neighbour in neighbours:
+            if state[neighbour] == COVERED:  # 空单元格的邻居不可能是地雷
+                state[neighbour] = REVEALED  # 揭示单元格
+                revealed.append(neighbour)
+                if adjacent[neighbour] == 0:  # 继续扩展空单元格
+                    stack.append(neighbour)
+
+    board.revealed_safe += len(revealed)  # 揭示的都是非地雷单元格
+    return [divmod(index, cols) for index in revealed]
+
+def count_revealed_safe(board):
+    """全板扫描统计已揭示的非地雷单元格数，用于校验增量计数器。"""
+    return int(np.count_nonzero((board.state == REVEALED) & ~board.mines))
+
+def check_win_loss(board):
+    """检查胜利或失败条件并更新游戏状态。"""
+    if board.game_state == 'lost':  # 如果已经失败，无需检查胜利
+        return
+
+    revealed_non_mines = board.revealed_safe  # 增量维护的计数，O(1)
+    if DEBUG:  # 调试模式下与全板扫描的结果比对
+        assert revealed_non_mines == count_revealed_safe(board), 'revealed_safe counter out of sync'
+
+    if revealed_non_mines == board.total_non_mines:  # 如果所有非地雷单元格都被揭示
+        board.game_state = 'won'  # 设置游戏状态为胜利
+
+
+# --- 二进制存档 ---
+# 文件头：魔数、版本、行数、列数、地雷数、地雷是否已放置、踩中的地雷索引（-1 表示没有）
+SAVE_MAGIC = b'MSWP'
+SAVE_VERSION = 2
+SAVE_HEADER = struct.Struct('<4sBIIIBq')
+
+def dumps_board(board):
+    """把游戏板和每个单元格的状态打包成紧凑的二进制：每格1位地雷 + 2位状态。"""
+    cells = board.rows * board.cols
+    dead = -1 if board.dead is None else board.dead[0] * board.cols + board.dead[1]
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, board.rows, board.cols, board.num_mines,
+                              board.mines_placed, dead)
+    mines = np.packbits(board.mines.reshape(-1))  # 每个单元格1位
+    state = np.zeros(-(-cells // 4) * 4, dtype=np.uint8)  # 补齐到4的倍数
+    state[:cells] = board.state.reshape(-1)
+    state = state[0::4] | state[1::4] << 2 | state[2::4] << 4 | state[3::4] << 6  # 每个单元格2位
+    return header + mines.tobytes() + state.tobytes()
+
+def loads_board(data):
+    """从 dumps_board 生成的二进制恢复游戏板，相邻地雷数、计数器和游戏状态会重新计算。"""
+    magic, version, rows, cols, num_mines, mines_placed, dead = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC or version != SAVE_VERSION:
+        raise ValueError('not a Minesweeper board save')
+    cells = rows * cols
+    mines_size = -(-cells // 8)  # 地雷位图的字节数
+    state_size = -(-cells // 4)  # 状态的字节数
+    if len(data) != SAVE_HEADER.size + mines_size + state_size:
+        raise ValueError('truncated Minesweeper board save')
+
+    board = Board(rows, cols, num_mines)
+    body = np.frombuffer(data, dtype=np.uint8, offset=SAVE_HEADER.size)
+    board.mines[:] = np.unpackbits(body[:mines_size], count=cells).reshape(rows, cols)
+    packed = body[mines_size:]
+    state = np.stack([packed & 3, packed >> 2 & 3, packed >> 4 & 3, packed >> 6 & 3], axis=1)
+    board.state[:] = state.reshape(-1)[:cells].reshape(rows, cols)
+    board.adjacent[:] = count_adjacent_mines(board.mines)
+    board.flag_counts[:] = count_adjacent_flags(board.state)
+    board.mines_placed = bool(mines_placed)
+    board.dead = None if dead < 0 else divmod(dead, cols)
+    board.revealed_safe = count_revealed_safe(board)
+    if board.dead is not None:
+        board.game_state = 'lost'
+    else:
+        check_win_loss(board)
+    return board
+
+def save_board(board, path):
+    """把游戏板保存到文件。"""
+    with open(path, 'wb') as f:
+        f.write(dumps_board(board))
+
+def load_board(path):
+    """从文件读取游戏板。"""
+    with open(path, 'rb') as f:
+        return loads_board(f.read())
@@ -0,0 +1,169 @@
+#!/bin/env python
+"""
+超大/无边界扫雷的 pygame 前端：只绘制视口内的单元格，可以滚动浏览。
+
+运行方式：
+    python huge.py                              # 无边界游戏板，地雷密度 20%
+    python huge.py --rows 100000 --cols 100000  # 有边界的超大游戏板
+
+操作：
+    左键揭示（点击周围旗帜数已满足的数字时连开）、右键标记、中键拖动或方向键/WASD 滚动、滚轮上下滚动（按住 Shift 左右滚动）、
+    R 重新开始、ESC 退出
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import sys  # 用于系统操作，如退出程序
+
+import pygame  # 用于创建游戏窗口和处理图形
+
+import chunked
+from engine import LEFT, RIGHT
+from atlas import TileAtlas, TILE_COVERED, cell_tile
+from pacer import FramePacer
+from text_cache import render_text
+
+# 定义屏幕尺寸
+WIDTH, HEIGHT = 800, 600  # 游戏窗口的宽度和高度
+CELL_SIZE = 30  # 每个单元格的大小
+SCROLL_SPEED = 15  # 按住方向键时每帧滚动的像素数
+WHEEL_SPEED = 3 * CELL_SIZE  # 滚轮每格滚动的像素数
+OUTSIDE = (40, 40, 40)  # 游戏板边界以外区域的颜色
+
+# 方向键和 WASD 对应的滚动方向
+SCROLL_KEYS = {
+    pygame.K_LEFT: (-1, 0), pygame.K_a: (-1, 0),
+    pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
+    pygame.K_UP: (0, -1), pygame.K_w: (0, -1),
+    pygame.K_DOWN: (0, 1), pygame.K_s: (0, 1),
+}
+
+
+def tile_index(board, row, col):
+    """计算 (row, col) 要绘制的图块；还没生成的区块一律显示为覆盖，绘制不会生成区块。"""
+    chunk, r, c = board.peek(row, col)
+    if chunk is None:
+        return TILE_COVERED
+    adjacent = chunk.adjacent[r, c] if chunk.adjacent is not None else 0  # 只有已揭示的数字需要相邻地雷数
+    return cell_tile(chunk.state[r, c], chunk.mines[r, c], adjacent, board.dead == (row, col))
+
+
+class Viewport:
+    """视口：左上角在游戏板上的像素坐标。"""
+
+    def __init__(self, board, width, height):
+        self.width = width  # 视口宽度
+        self.height = height  # 视口高度
+        # 有边界时从游戏板中央开始，无边界时以 (0, 0) 为中心
+        center_row = board.rows // 2 if board.rows is not None else 0
+        center_col = board.cols // 2 if board.cols is not None else 0
+        self.x = center_col * CELL_SIZE - width // 2
+        self.y = center_row * CELL_SIZE - height // 2
+
+    def scroll(self, dx, dy):
+        """滚动视口。"""
+        self.x += dx
+        self.y += dy
+
+    def to_cell(self, x, y):
+        """把屏幕像素坐标转换为游戏板坐标。"""
+        return (self.y + y) // CELL_SIZE, (self.x + x) // CELL_SIZE
+
+    def draw(self, screen, board, atlas):
+        """只绘制视口内的单元格。"""
+        screen.fill(OUTSIDE)
+        first_row, first_col = self.y // CELL_SIZE, self.x // CELL_SIZE
+        last_row, last_col = (self.y + self.height - 1) // CELL_SIZE, (self.x + self.width - 1) // CELL_SIZE
+        tiles = []
+        for row in range(first_row, last_row + 1):
+            y = row * CELL_SIZE - self.y
+            for col in range(first_col, last_col + 1):
+                if board.in_bounds(row, col):
+                    tiles.append((tile_index(board, row, col), (col * CELL_SIZE - self.x, y)))
+        atlas.blits(screen, tiles)
+
+
+def new_board(args, seed=None):
+    """按命令行参数创建游戏板。"""
+    return chunked.ChunkedBoard(args.density, seed, args.rows, args.cols, args.chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='超大/无边界扫雷')
+    parser.add_argument('--density', type=float, default=0.2, help='地雷密度')
+    parser.add_argument('--seed', type=int, default=None, help='随机数种子')
+    parser.add_argument('--rows', type=int, default=None, help='行数（默认无边界）')
+    parser.add_argument('--cols', type=int, default=None, help='列数（默认无边界）')
+    parser.add_argument('--chunk-size', type=int, default=chunked.CHUNK_SIZE, help='区块边长')
+    args = parser.parse_args()
+
+    # 初始化Pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))  # 创建游戏窗口
+    atlas = TileAtlas(CELL_SIZE)  # 加载图块图集
+
+    board = new_board(args, args.seed)
+    viewport = Viewport(board, WIDTH, HEIGHT)
+    pacer = FramePacer()  # 不滚动时阻塞等待输入
+    scrolling = set()  # 正在按住的滚动键
+    dragging = False  # 是否正在用中键拖动
+    redraw = True  # 是否需要重绘
+    running = True
+
+    while running:
+        for event in pacer.events(animating=bool(scrolling)):  # 按住滚动键时按帧率持续滚动
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                redraw = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_r:  # 重新开始
+                    board = new_board(args)
+                    redraw = True
+                elif event.key in SCROLL_KEYS:
+                    scrolling.add(event.key)
+            elif event.type == pygame.KEYUP:
+                scrolling.discard(event.key)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (LEFT, RIGHT):
+                row, col = viewport.to_cell(*event.pos)
+                if chunked.click(board, row, col, event.button):
+                    redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:  # 中键拖动
+                dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+                dragging = False
+            elif event.type == pygame.MOUSEMOTION and dragging:
+                viewport.scroll(-event.rel[0], -event.rel[1])
+                redraw = True
+            elif event.type == pygame.MOUSEWHEEL:
+                if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                    viewport.scroll(-event.y * WHEEL_SPEED, 0)
+                else:
+                    viewport.scroll(-event.x * WHEEL_SPEED, -event.y * WHEEL_SPEED)
+                redraw = True
+
+        for key in scrolling:  # 持续滚动
+            dx, dy = SCROLL_KEYS[key]
+            viewport.scroll(dx * SCROLL_SPEED, dy * SCROLL_SPEED)
+            redraw = True
+
+        if redraw:
+            viewport.draw(screen, board, atlas)
+            if board.game_state != 'playing':  # 显示游戏结束消息（只有有边界的游戏板能胜利）
+                message = "You Win! Press R" if board.game_state == 'won' else "Game Over! Press R"
+                text = render_text(message, 50, (255, 0, 0))
+                screen.blit(text, text.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+            # 标题栏显示已生成的区块数和内存占用
+            pygame.display.set_caption(f'MineCraft Huge - {board.revealed_safe} revealed, '
+                                       f'{len(board.chunks)} chunks, {board.memory_bytes() // 1024} KiB')
+            pygame.display.flip()
+            redraw = False
+
+    pygame.quit()  # 退出Pygame
+    sys.exit()  # 退出程序
+
+
+if __name__ == "__main__":
+    main()  # 调用主函数
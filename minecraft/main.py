@@ -3,16 +3,15 @@
 # 导入必要的库
 import pygame  # 用于创建游戏窗口和处理图形
 import sys  # 用于系统操作，如退出程序
-import random  # 用于生成随机数，放置地雷
-import os  # 用于处理文件路径
-from dataclasses import dataclass  # 用于创建数据类
-from typing import Literal  # 用于类型提示
 
-# 定义单元格类，用于表示游戏中的每个格子
-@dataclass
-class Cell:
-    value: Literal['mine', 'dead', 'number', 'flag', 'unk']  # 单元格的值：地雷、死亡、数字、旗帜、未知
-    state: Literal['covered', 'revealed', 'flagged']  # 单元格的状态：覆盖、揭示、标记
+# 游戏规则都在不依赖 pygame 的 engine 模块中，这里只负责显示和输入
+import engine
+from engine import DEBUG
+from atlas import TileAtlas, tile_indices, tile_index
+from pacer import FramePacer
+from text_cache import render_text
+from solver import Solver
+from replay import Recorder
 
 
 # 初始化Pygame
@@ -27,167 +26,95 @@ CELL_SIZE = 30  # 每个单元格的大小
 ROWS = HEIGHT // CELL_SIZE  # 行数
 COLS = WIDTH // CELL_SIZE  # 列数
 NUM_MINES = 10  # 地雷的数量
+HINT_SAFE = (0, 200, 0)  # 提示：必定安全的单元格边框颜色
+HINT_MINE = (220, 0, 0)  # 提示：必定是地雷的单元格边框颜色
 
 
 # 设置游戏窗口
 screen = pygame.display.set_mode((WIDTH, HEIGHT))  # 创建游戏窗口
 pygame.display.set_caption("MineCraft")  # 设置窗口标题
 
-# 获取当前脚本的目录
-script_dir = os.path.dirname(__file__)
-# 加载图像
-images = [os.path.join(script_dir, 'img', f'{num}.gif') for num in range(0, 14)]
-# 加载图像
-images = [pygame.image.load(img) for img in images]
-# 调整图像大小
-images = [pygame.transform.scale(img, (CELL_SIZE, CELL_SIZE)) for img in images]
-# 构建图像映射，方便使用
-image_map = {
-    'number_0': images[0],
-    'number_1': images[1],
-    'number_2': images[2],
-    'number_3': images[3],
-    'number_4': images[4],
-    'number_5': images[5],
-    'number_6': images[6],
-    'number_7': images[7],
-    'number_8': images[8],
-    'covered': images[9],
-    'flag': images[10],
-    'mine': images[11],
-    'unk': images[12],
-    'dead': images[13],
-}
+# 加载图块图集：按 CELL_SIZE 缩放并转换为显示格式，结果缓存在磁盘上
+atlas = TileAtlas(CELL_SIZE)
 
 # --- 游戏变量 ---
-board = [[]]  # 全局变量，用于存储游戏板的状态
-game_state = 'playing'  # 游戏状态：'playing'（游戏中）, 'won'（胜利）, 'lost'（失败）
-total_non_mines = 0  # 存储非地雷单元格的总数
+board = None  # 全局变量，用于存储游戏板的状态
+solver = None  # 跟随游戏板增量推导的提示引擎
+recorder = None  # 当前对局的录像
 
 # --- 游戏函数 ---
 
-def create_board():
-    """创建并初始化游戏板。"""
-    global board, total_non_mines
-    board = [[Cell('number', 'covered') for _ in range(COLS)] for _ in range(ROWS)]  # 初始化游戏板
-    total_cells = ROWS * COLS  # 计算总单元格数
-    total_non_mines = total_cells - NUM_MINES  # 计算非地雷单元格数
-
-    # 放置地雷
-    mines_placed = 0
-    while mines_placed < NUM_MINES:
-        row = random.randint(0, ROWS - 1)  # 随机选择行
-        col = random.randint(0, COLS - 1)  # 随机选择列
-        if board[row][col].value != 'mine':  # 如果该单元格不是地雷
-            board[row][col].value = 'mine'  # 放置地雷
-            mines_placed += 1
-
-    # 计算非地雷单元格周围的数字
-    for r in range(ROWS):
-        for c in range(COLS):
-            if board[r][c].value != 'mine':  # 如果当前单元格不是地雷
-                num_adjacent_mines = 0  # 初始化相邻地雷数
-                for dr in [-1, 0, 1]:  # 遍历相邻的行
-                    for dc in [-1, 0, 1]:  # 遍历相邻的列
-                        if dr == 0 and dc == 0:  # 跳过当前单元格
-                            continue
-                        nr, nc = r + dr, c + dc  # 计算相邻单元格的位置
-                        if 0 <= nr < ROWS and 0 <= nc < COLS and board[nr][nc].value == 'mine':  # 检查是否在地雷
-                            num_adjacent_mines += 1  # 增加相邻地雷数
-                board[r][c].value = f'number_{num_adjacent_mines}'  # 设置单元格的值
-
-def draw_board(screen):
-    """绘制当前游戏板的状态。"""
-    for r in range(ROWS):
-        for c in range(COLS):
-            cell = board[r][c]  # 获取当前单元格
-            x = c * CELL_SIZE  # 计算单元格的x坐标
-            y = r * CELL_SIZE  # 计算单元格的y坐标
-            rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)  # 创建单元格的矩形
-            if cell.state == 'covered':  # 如果单元格被覆盖
-                screen.blit(image_map['covered'], rect.topleft)  # 绘制覆盖图像
-            elif cell.state == 'flagged':  # 如果单元格被标记
-                if cell.value == 'flag':  # 如果单元格的值是旗帜
-                    screen.blit(image_map['flag'], rect.topleft)  # 绘制旗帜图像
-                elif cell.value == 'unk':  # 如果单元格的值是未知
-                    screen.blit(image_map['unk'], rect.topleft)  # 绘制未知图像
-                else:
-                    print(f'Unknown Cell value for flagged state: {cell.value}')  # 打印错误信息
-                    assert False  # 断言失败
-            elif cell.state == 'revealed':  # 如果单元格被揭示
-                screen.blit(image_map[cell.value], rect.topleft)  # 绘制揭示图像
-            else:
-                print(f'Unknown state: {cell.state}')  # 打印错误信息
-                assert False  # 断言失败
+def create_board(seed=None):
+    """创建并初始化游戏板。seed 可以是整数种子或 random.Random 实例，省略时随机选一个。
+
+    录像把种子存为无符号64位整数，整数种子必须在 [0, 2**64) 内。
+    """
+    global board, solver, recorder
+    if not isinstance(seed, int):  # 录像需要整数种子
+        seed = engine.make_rng(seed).getrandbits(63)
+    elif not 0 <= seed < 1 << 64:
+        raise ValueError(f'seed must be in [0, 2**64) to be recorded, got {seed}')
+    board = engine.create_board(ROWS, COLS, NUM_MINES, seed)  # 初始化游戏板
+    solver = Solver(board)  # 新游戏板对应新的提示引擎
+    recorder = Recorder(board, seed)  # 录制这一局
+
+create_board()  # 导入时就创建第一局，handle_click 可以直接使用
+
+def draw_board(screen, cells=None):
+    """绘制游戏板，返回需要刷新到屏幕上的矩形列表。
+
+    cells 为 None 时重绘整个游戏板；否则只重绘给定的 (row, col) 单元格。
+    """
+    if cells is None:  # 全量重绘
+        tiles = tile_indices(board)  # 计算每个单元格的图像索引
+        atlas.blits(screen, [(tiles[r, c], (c * CELL_SIZE, r * CELL_SIZE))
+                             for r in range(board.rows) for c in range(board.cols)])
+        return [screen.get_rect()]
+
+    rects = []  # 本帧变化的区域
+    for r, c in cells:
+        x = c * CELL_SIZE  # 计算单元格的x坐标
+        y = r * CELL_SIZE  # 计算单元格的y坐标
+        rects.append(atlas.blit(screen, tile_index(board, r, c), (x, y)))  # 绘制单元格图像
+    return rects
 
 
 def handle_click(x, y, button):
+    """处理一次点击，返回状态发生变化的 (row, col) 单元格列表，供渲染器局部重绘。"""
     # 将像素坐标转换为游戏板坐标
     col = x // CELL_SIZE
     row = y // CELL_SIZE
 
-    # 检查点击是否在游戏板边界内
-    if 0 <= row < ROWS and 0 <= col < COLS:
-        cell = board[row][col]  # 获取当前单元格
-
-        # 左键点击（按钮1）揭示单元格
-        if button == 1 and cell.state == 'covered':
-            if cell.value == 'mine':  # 如果点击到地雷
-                cell.value = 'dead'  # 设置单元格值为死亡
-                cell.state = 'revealed'  # 揭示单元格
-                global game_state
-                game_state = 'lost'  # 设置游戏状态为失败
-                print("Game Over! You hit a mine.")  # 简单通知
-            elif cell.value == 'number_0':  # 如果是空单元格
-                reveal_empty_cells(row, col)  # 揭示空单元格
-                check_win_loss()  # 检查胜利或失败
-            else:  # 如果是数字单元格
-                cell.state = 'revealed'  # 揭示单元格
-
-        # 右键点击（按钮3）标记单元格
-        elif button == 3:
-            if cell.state == 'covered':  # 如果单元格被覆盖
-                cell.state = 'flagged'  # 标记单元格
-                cell.value = 'flag'  # 设置单元格值为旗帜
-            elif cell.state == 'flagged' and cell.value == 'flag':  # 如果单元格被标记为旗帜
-                cell.value = 'unk'  # 设置单元格值为未知
-            else:
-                cell.state = 'covered'  # 覆盖单元格
-
-
-def reveal_empty_cells(row, col):
-    """递归揭示空单元格和相邻的数字单元格。"""
-    # 检查边界和是否已经揭示或标记
-    if not (0 <= row < ROWS and 0 <= col < COLS) or board[row][col].state != 'covered':
-        return
-
-    cell = board[row][col]  # 获取当前单元格
-    cell.state = 'revealed'  # 揭示单元格
-
-    # 如果是空单元格（number_0），递归揭示相邻单元格
-    if cell.value == 'number_0':
-        for dr in [-1, 0, 1]:  # 遍历相邻的行
-            for dc in [-1, 0, 1]:  # 遍历相邻的列
-                if dr == 0 and dc == 0:  # 跳过当前单元格
-                    continue
-                reveal_empty_cells(row + dr, col + dc)  # 递归揭示相邻单元格
-
-def check_win_loss():
-    """检查胜利或失败条件并更新游戏状态。"""
-    global game_state
-    if game_state == 'lost':  # 如果已经失败，无需检查胜利
-        return
-
-    revealed_non_mines = 0  # 初始化已揭示的非地雷单元格数
-    for r in range(ROWS):
-        for c in range(COLS):
-            cell = board[r][c]  # 获取当前单元格
-            if cell.state == 'revealed' and cell.value != 'mine':  # 如果单元格被揭示且不是地雷
-                revealed_non_mines += 1  # 增加已揭示的非地雷单元格数
-
-    if revealed_non_mines == total_non_mines:  # 如果所有非地雷单元格都被揭示
-        game_state = 'won'  # 设置游戏状态为胜利
+    action = engine.effective_button(board, row, col, button)  # 录制实际执行的操作（左键点数字是连开）
+    changed = engine.click(board, row, col, button)  # 交给引擎处理游戏规则
+    solver.update(changed)  # 只更新受影响的约束
+    if changed:
+        recorder.record(row, col, action)  # 只录制改变了游戏板的点击
+    if changed and board.game_state == 'lost':  # 本次点击踩中地雷
+        print("Game Over! You hit a mine.")  # 简单通知
+    elif changed and board.game_state == 'won':  # 本次点击揭示了最后一个非地雷单元格
         print("Congratulations! You won!")  # 简单通知
+    if changed and board.game_state != 'playing':  # 对局结束，保存录像
+        print(f"Replay saved to {recorder.save()}")
+    return changed
+
+
+def draw_hints(screen):
+    """给必定安全（绿色）和必定是地雷（红色）的单元格画边框，返回绘制的矩形列表。"""
+    safe, mines = solver.hints()
+    rects = []
+    for cells, color in ((safe, HINT_SAFE), (mines, HINT_MINE)):
+        for r, c in cells:
+            rects.append(pygame.draw.rect(screen, color, (c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE), 2))
+    return rects
+
+
+def draw_message(screen):
+    """在屏幕中央显示游戏结束消息，返回消息所占的矩形。"""
+    message = "You Win!" if board.game_state == 'won' else "Game Over!"  # 设置消息
+    text = render_text(message, 50, (255, 0, 0))  # 渲染文本（使用缓存，只渲染一次）
+    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))  # 获取文本矩形
+    return screen.blit(text, text_rect)  # 绘制文本
 
 # --- 主游戏循环 ---
 def main():
@@ -195,17 +122,29 @@ def main():
     create_board()  # 调用create_board初始化游戏板
 
     active_fingers = set()  # 用于跟踪活动的手指ID
+    dirty_cells = set()  # 自上一帧以来发生变化的单元格
+    full_redraw = True  # 是否需要重绘整个窗口（首帧、窗口尺寸变化或被遮挡后恢复、游戏结束）
+    show_hints = False  # 是否显示提示（按 H 切换）
+    pacer = FramePacer()  # 没有输入时阻塞等待，不空转
 
     while running:
-        for event in pygame.event.get():
+        # 扫雷没有持续动画，只在有输入时才需要处理和重绘
+        for event in pacer.events(animating=False):
             if event.type == pygame.QUIT:  # 如果事件类型是退出
                 running = False  # 停止游戏循环
-            
-            if game_state == 'playing':  # 如果游戏状态是游戏中
+
+            if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):  # 窗口内容需要整体刷新
+                full_redraw = True
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h:  # 切换提示
+                show_hints = not show_hints
+                full_redraw = True
+
+            if board.game_state == 'playing':  # 如果游戏状态是游戏中
                 # 处理鼠标点击
                 if event.type == pygame.MOUSEBUTTONDOWN:  # 如果事件类型是鼠标按下
                     x, y = event.pos  # 获取鼠标位置
-                    handle_click(x, y, event.button)  # 处理点击
+                    dirty_cells.update(handle_click(x, y, event.button))  # 处理点击
 
                 # 处理触摸事件
                 if event.type == pygame.FINGERDOWN:  # 如果事件类型是手指按下
@@ -215,12 +154,12 @@ def main():
                         x = int(event.x * WIDTH)  # 计算x坐标
                         y = int(event.y * HEIGHT)  # 计算y坐标
                         # 模拟右键点击（按钮3）
-                        handle_click(x, y, 3)  # 处理点击
+                        dirty_cells.update(handle_click(x, y, 3))  # 处理点击
                     elif len(active_fingers) == 1:  # 如果只有一个活动手指
                         # 模拟左键点击
                         x = int(event.x * WIDTH)  # 计算x坐标
                         y = int(event.y * HEIGHT)  # 计算y坐标
-                        handle_click(x, y, 1)  # 处理点击
+                        dirty_cells.update(handle_click(x, y, 1))  # 处理点击
 
                 if event.type == pygame.FINGERUP:  # 如果事件类型是手指抬起
                     if event.finger_id in active_fingers:  # 如果手指ID在活动手指中
@@ -228,21 +167,33 @@ def main():
 
                 # 我们也可以处理FINGERMOTION如果需要手势
 
-        # --- 绘制 ---
-        # screen.fill(WHITE)  # 填充背景
-        draw_board(screen)  # 绘制游戏板
-        
-        # 显示游戏状态消息
-        if game_state != 'playing':  # 如果游戏状态不是游戏中
-            font = pygame.font.Font(None, 50)  # 创建字体
-            message = "You Win!" if game_state == 'won' else "Game Over!"  # 设置消息
-            text = font.render(message, True, (255, 0, 0))  # 渲染文本
-            text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))  # 获取文本矩形
-            screen.blit(text, text_rect)  # 绘制文本
-
-        # --- 更新显示 ---
-        pygame.display.flip()  # 更新显示
+                if board.game_state != 'playing':  # 本次点击结束了游戏，整体重绘并显示消息
+                    full_redraw = True
 
+        # --- 绘制 ---
+        # 变化的单元格超过四分之一时，整体重绘比逐个矩形刷新更快
+        if dirty_cells and len(dirty_cells) * 4 > board.rows * board.cols:
+            full_redraw = True
+
+        if full_redraw:  # 整体重绘
+            draw_board(screen)  # 绘制游戏板
+            if board.game_state != 'playing':  # 显示游戏状态消息
+                draw_message(screen)
+            elif show_hints:  # 显示提示
+                draw_hints(screen)
+            pygame.display.flip()  # 更新整个显示
+            full_redraw = False
+        elif dirty_cells:  # 只重绘变化的单元格
+            rects = draw_board(screen, dirty_cells)
+            if show_hints:  # 变化的单元格会覆盖旧的边框，新的提示需要补画
+                rects += draw_hints(screen)
+            pygame.display.update(rects)  # 只刷新变化的区域
+        dirty_cells.clear()
+
+    if board.game_state == 'playing' and recorder.save():  # 中途退出的对局也保存录像
+        print("Unfinished game saved to replays/")
+    if DEBUG:  # 调试模式下打印帧节奏统计
+        print(pacer.stats())
     pygame.quit()  # 退出Pygame
     sys.exit()  # 退出程序
 
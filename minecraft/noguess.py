@@ -0,0 +1,125 @@
+#!/bin/env python
+"""
+无需猜测的游戏板生成器：给定第一次点击的位置，生成只靠推导就能赢的游戏板。
+
+候选游戏板用 engine.create_board 和 engine.place_mines 生成（与正常游戏相同的布雷和相邻地雷数计算），
+再用 solver.Solver 从第一次点击开始只揭示推导出的安全单元格，能赢的才保留。
+高级（16x30, 99雷）游戏板的拒绝率很高，候选的生成和检查分批分散到多个进程中进行。
+
+生成结果是种子：相同的尺寸、地雷数、种子和第一次点击总能重建出同一个游戏板（见 board_from_seed）。
+
+运行方式：
+    python noguess.py --count 10                       # 生成10个高级游戏板的种子
+    python noguess.py --count 10 --out drops/          # 同时把游戏板保存为存档文件
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import os  # 用于创建输出目录
+import random  # 用于生成候选种子
+import time  # 用于计时和超时
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait  # 用于多进程生成和检查
+
+import numpy as np  # 用于统计剩余的未揭示单元格
+
+import engine
+from engine import COVERED, REVEALED, LEFT
+from solver import Solver
+
+BATCH_SIZE = 64  # 每个任务检查的候选数量，太小时进程间通信的开销占比过高
+
+
+def board_from_seed(rows, cols, num_mines, seed, first_click):
+    """由种子重建游戏板：地雷已按第一次点击放好，所有单元格仍被覆盖。"""
+    board = engine.create_board(rows, cols, num_mines, seed)
+    engine.place_mines(board, *first_click)
+    return board
+
+
+def is_no_guess(board, first_click):
+    """从第一次点击开始只揭示推导出的安全单元格，返回能否赢下这局（会修改 board）。"""
+    solver = Solver(board)
+    solver.update(engine.click(board, *first_click, LEFT))
+    while board.game_state == 'playing':
+        safe, _ = solver.hints()
+        if not safe and len(solver.mines) == board.num_mines:
+            # 全局地雷数：地雷都已确定，其余被覆盖的单元格（例如被地雷围住的区域）都安全
+            safe = [tuple(cell) for cell in np.argwhere(board.state == COVERED)
+                    if tuple(cell) not in solver.mines]
+        if not safe:  # 必须猜测
+            return False
+        for row, col in safe:
+            if board.state[row, col] != REVEALED:  # 可能已经被之前的连锁揭示
+                solver.update(engine.click(board, row, col, LEFT))
+    return board.game_state == 'won'
+
+
+def check_candidates(rows, cols, num_mines, first_click, seeds):
+    """检查一批候选种子，返回其中无需猜测的种子。在工作进程中运行。"""
+    return [seed for seed in seeds
+            if is_no_guess(engine.create_board(rows, cols, num_mines, seed), first_click)]
+
+
+def generate(rows, cols, num_mines, first_click, count, timeout=None, workers=None, seed=None,
+             batch_size=BATCH_SIZE):
+    """生成最多 count 个无需猜测的游戏板种子。
+
+    timeout（秒）到了就返回已经找到的种子，可能少于 count 个（正在运行的批次会先完成）。
+    workers 为 None 时使用所有 CPU。
+    候选种子由 seed 确定，但结果的顺序取决于各进程完成的先后。
+    """
+    rng = random.Random(seed)
+    workers = workers or os.cpu_count() or 1
+    deadline = None if timeout is None else time.monotonic() + timeout
+    found = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit():
+            seeds = [rng.getrandbits(63) for _ in range(batch_size)]
+            return executor.submit(check_candidates, rows, cols, num_mines, first_click, seeds)
+
+        # 每个进程保持两个任务在排队，避免等待主进程分发
+        pending = {submit() for _ in range(2 * workers)}
+        while pending and len(found) < count:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                found.extend(future.result())
+                pending.add(submit())
+        for future in pending:  # 已经够了或超时：不再开始排队中的任务
+            future.cancel()
+    return found[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成无需猜测的扫雷游戏板')
+    parser.add_argument('--rows', type=int, default=16, help='行数')
+    parser.add_argument('--cols', type=int, default=30, help='列数')
+    parser.add_argument('--mines', type=int, default=99, help='地雷数')
+    parser.add_argument('--click', type=int, nargs=2, default=None, metavar=('ROW', 'COL'),
+                        help='第一次点击的位置（默认为中央）')
+    parser.add_argument('--count', type=int, default=10, help='要生成的游戏板数量')
+    parser.add_argument('--timeout', type=float, default=None, help='超时（秒）')
+    parser.add_argument('--workers', type=int, default=None, help='进程数（默认使用所有 CPU）')
+    parser.add_argument('--seed', type=int, default=None, help='生成候选种子的种子')
+    parser.add_argument('--out', default=None, help='保存游戏板存档的目录')
+    args = parser.parse_args()
+
+    first_click = tuple(args.click) if args.click else (args.rows // 2, args.cols // 2)
+    start = time.perf_counter()
+    seeds = generate(args.rows, args.cols, args.mines, first_click, args.count,
+                     args.timeout, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f'{len(seeds)} boards in {elapsed:.1f}s (first click {first_click})')
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    for seed in seeds:
+        print(seed)
+        if args.out:
+            board = board_from_seed(args.rows, args.cols, args.mines, seed, first_click)
+            engine.save_board(board, os.path.join(args.out, f'{seed}.mswp'))
+
+
+if __name__ == "__main__":
+    main()  # 调用主函数
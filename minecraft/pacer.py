@@ -0,0 +1,70 @@
+"""
+帧节奏控制：空闲时阻塞等待输入，不让窗口空转占满 CPU；有动画时按帧率上限运行。
+
+扫雷的各个 pygame 前端（main.py、huge.py）共用。
+"""
+
+# 导入必要的库
+import time  # 用于统计帧耗时
+
+import pygame  # 用于等待事件和限制帧率
+
+# 帧节奏设置
+IDLE_TIMEOUT_MS = 1000  # 空闲时阻塞等待输入的最长时间（毫秒），超时后唤醒一次以便处理计时器
+ANIMATION_FPS = 60  # 有动画播放时的帧率上限
+
+
+class FramePacer:
+    """帧节奏控制：空闲时阻塞等待输入，有动画时按帧率上限运行，并统计帧耗时。"""
+
+    def __init__(self, fps=ANIMATION_FPS, idle_timeout=IDLE_TIMEOUT_MS):
+        self.fps = fps  # 动画时的帧率上限
+        self.idle_timeout = idle_timeout  # 空闲时的最长等待时间（毫秒）
+        self.clock = pygame.time.Clock()  # 用于限制动画帧率
+        self.frames = 0  # 已完成的帧数
+        self.timeouts = 0  # 空闲等待超时（没有任何输入）的次数
+        self.wait_time = 0.0  # 等待输入或限帧休眠的总时间（秒）
+        self.work_time = 0.0  # 处理事件和绘制的总时间（秒）
+        self.max_work_time = 0.0  # 单帧最长的处理时间（秒）
+        self._started = time.perf_counter()  # 开始计时的时间
+        self._frame_start = None  # 当前帧开始处理的时间
+
+    def events(self, animating=False):
+        """结束上一帧并返回下一帧要处理的事件。
+
+        animating 为 False 时阻塞直到有输入或超时，不占用 CPU；
+        为 True 时按 fps 限帧，立即返回当前所有事件。
+        """
+        now = time.perf_counter()
+        if self._frame_start is not None:  # 统计上一帧的处理时间
+            work = now - self._frame_start
+            self.work_time += work
+            self.max_work_time = max(self.max_work_time, work)
+            self.frames += 1
+
+        if animating:  # 动画中：限制帧率
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:  # 空闲：阻塞等待下一个事件
+            event = pygame.event.wait(self.idle_timeout)
+            if event.type == pygame.NOEVENT:  # 超时，没有输入
+                self.timeouts += 1
+                events = []
+            else:  # 顺便取出队列中剩余的事件
+                events = [event] + pygame.event.get()
+
+        self._frame_start = time.perf_counter()
+        self.wait_time += self._frame_start - now
+        return events
+
+    def stats(self):
+        """返回帧节奏统计信息。"""
+        elapsed = time.perf_counter() - self._started  # 总运行时间
+        return {
+            'frames': self.frames,  # 帧数
+            'timeouts': self.timeouts,  # 空闲超时次数
+            'fps': self.frames / elapsed if elapsed else 0.0,  # 平均帧率
+            'avg_frame_ms': self.work_time / self.frames * 1e3 if self.frames else 0.0,  # 平均每帧处理时间
+            'max_frame_ms': self.max_work_time * 1e3,  # 最长单帧处理时间
+            'idle_ratio': self.wait_time / elapsed if elapsed else 0.0,  # 空闲时间占比
+        }
@@ -0,0 +1,275 @@
+"""
+扫雷地雷概率计算：给出每个未揭示单元格是地雷的精确概率。
+
+在 solver.Solver 增量维护的约束之上工作：
+
+- solver 已经推导出的单元格概率为 0 或 1，不参与枚举；
+- 剩下的约束按共享单元格拆分成互相独立的连通分量，每个分量用回溯枚举所有满足约束的地雷分布，
+  按地雷数统计方案数和每个单元格是地雷的方案数；
+- 不与任何数字相邻的单元格（内部单元格）共同分配剩下的地雷，用全局地雷数把各分量组合起来。
+
+分量的枚举结果按平移到原点后的约束缓存（LRU），同样形状的分量在其他位置、其他对局中也能直接复用。
+分量的划分本身也跨查询保留：solver 记下每次更新改动过的约束，揭示一个单元格后只有它影响到的分量
+需要重新拆分、平移和查找缓存。与 engine 模块一样不依赖 pygame。
+"""
+
+# 导入必要的库
+import math  # 用于计算组合数的对数
+from collections import OrderedDict  # 用于实现 LRU 淘汰顺序
+
+import numpy as np  # 用于组合各分量的分布和输出概率数组
+
+from engine import REVEALED
+from solver import Solver
+
+MAX_COMPONENTS = 4096  # 最多缓存的分量枚举结果数量
+
+
+class ComponentCache:
+    """分量枚举结果的 LRU 缓存，键是平移到原点后的约束。"""
+
+    def __init__(self, max_components=MAX_COMPONENTS):
+        self.max_components = max_components  # 缓存数量上限
+        self.components = OrderedDict()  # 约束 -> (单元格列表, {地雷数: (方案数, 每个单元格是地雷的方案数)})，最近使用的在末尾
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中（需要枚举）的次数
+
+    def get(self, key):
+        """返回缓存的枚举结果，没有则为 None。"""
+        result = self.components.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.components.move_to_end(key)  # 标记为最近使用
+        return result
+
+    def put(self, key, result):
+        """缓存枚举结果，超出上限时淘汰最久未使用的结果。"""
+        self.components[key] = result
+        if len(self.components) > self.max_components:
+            self.components.popitem(last=False)
+
+    def clear(self):
+        """清空缓存。"""
+        self.components.clear()
+
+
+# 所有对局共用的默认缓存
+default_cache = ComponentCache()
+
+
+def split_components(constraints, cell_constraints, starts=None):
+    """把约束按共享单元格拆分成连通分量，返回每个分量的约束键列表。
+
+    给出 starts 时只返回包含这些约束的分量。
+    """
+    components = []
+    seen = set()
+    for start in constraints if starts is None else starts:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        stack = [start]
+        while stack:
+            key = stack.pop()
+            for cell in constraints[key][0]:
+                for other in cell_constraints[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        component.append(other)
+                        stack.append(other)
+        components.append(component)
+    return components
+
+
+def normalize(constraints):
+    """把一个分量的约束平移到原点，返回 (缓存键, 行偏移, 列偏移)。"""
+    top = min(r for cells, _ in constraints for r, _ in cells)
+    left = min(c for cells, _ in constraints for _, c in cells)
+    key = tuple(sorted((tuple(sorted((r - top, c - left) for r, c in cells)), remaining)
+                       for cells, remaining in constraints))
+    return key, top, left
+
+
+def enumerate_component(key):
+    """回溯枚举一个分量中所有满足约束的地雷分布。
+
+    返回 (单元格列表, {地雷数: (方案数, 每个单元格是地雷的方案数列表)})。
+    """
+    # 按约束的顺序排列单元格，让每条约束尽早被填满，便于剪枝
+    cells = []
+    index = {}
+    for constraint_cells, _ in key:
+        for cell in constraint_cells:
+            if cell not in index:
+                index[cell] = len(cells)
+                cells.append(cell)
+    need = [remaining for _, remaining in key]  # 每条约束还需要的地雷数
+    free = [len(constraint_cells) for constraint_cells, _ in key]  # 每条约束还未赋值的单元格数
+    of_cell = [[] for _ in cells]  # 每个单元格所在的约束
+    for i, (constraint_cells, _) in enumerate(key):
+        for cell in constraint_cells:
+            of_cell[index[cell]].append(i)
+
+    n = len(cells)
+    assignment = [0] * n
+    results = {}
+
+    def backtrack(pos, mines):
+        if pos == n:  # 找到一个完整方案，按地雷数累计
+            ways, counts = results.get(mines) or results.setdefault(mines, [0, [0] * n])
+            results[mines][0] = ways + 1
+            for i in range(n):
+                counts[i] += assignment[i]
+            return
+        constraints = of_cell[pos]
+        for value in (0, 1):
+            # 赋值后每条约束还需要的地雷数必须在 0 和剩下的单元格数之间
+            if all(0 <= need[c] - value <= free[c] - 1 for c in constraints):
+                for c in constraints:
+                    need[c] -= value
+                    free[c] -= 1
+                assignment[pos] = value
+                backtrack(pos + 1, mines + value)
+                for c in constraints:
+                    need[c] += value
+                    free[c] += 1
+        assignment[pos] = 0
+
+    backtrack(0, 0)
+    return cells, {mines: (ways, counts) for mines, (ways, counts) in results.items()}
+
+
+def log_binomial(n, k):
+    """组合数 C(n, k) 的自然对数。"""
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+class ProbabilityEngine:
+    """跟随一个 engine.Board 的地雷概率计算器。可以与前端共用同一个 Solver。"""
+
+    def __init__(self, board, solver=None, cache=None):
+        self.board = board  # 跟随的游戏板
+        self.solver = Solver(board) if solver is None else solver  # 维护约束和确定的单元格
+        self.cache = default_cache if cache is None else cache  # 分量枚举结果的缓存
+        self.components = {}  # 分量编号 -> (约束键列表, 单元格列表, 分布)
+        self.component_of = {}  # 约束键 -> 所在分量的编号
+        self.next_id = 0  # 下一个新分量的编号
+        self.solver.dirty.update(self.solver.constraints)  # 第一次查询时划分全部现有约束
+
+    def update(self, changed):
+        """用一次操作中状态变化的单元格更新约束（与 Solver.update 相同）。"""
+        self.solver.update(changed)
+
+    def refresh(self):
+        """按 solver 记下的改动更新分量划分，只重新拆分和查找受影响的分量。
+
+        改动记录读取后清空，所以一个 Solver 只能跟一个 ProbabilityEngine 共用。
+        """
+        solver = self.solver
+        constraints, dirty = solver.constraints, solver.dirty
+        if not dirty:
+            return
+        # 包含改动约束的分量作废，从其中仍然存在的约束和改动的约束重新拆分
+        stale = {self.component_of[key] for key in dirty if key in self.component_of}
+        starts = {key for key in dirty if key in constraints}
+        for i in stale:
+            starts.update(key for key in self.components[i][0] if key in constraints)
+        fresh = split_components(constraints, solver.cell_constraints, starts)
+        # 新约束可能把几个原来的分量连在一起，被连进来的分量也作废
+        for keys in fresh:
+            stale.update(self.component_of[key] for key in keys if key in self.component_of)
+        for i in stale:
+            for key in self.components.pop(i)[0]:
+                del self.component_of[key]
+        for keys in fresh:
+            self.components[self.next_id] = (keys, *self.component(keys))
+            for key in keys:
+                self.component_of[key] = self.next_id
+            self.next_id += 1
+        dirty.clear()
+
+    def component(self, keys):
+        """返回一个分量的 (单元格列表, 分布)，单元格已平移回游戏板坐标。"""
+        constraints = [self.solver.constraints[key] for key in keys]
+        key, top, left = normalize(constraints)
+        result = self.cache.get(key)
+        if result is None:
+            result = enumerate_component(key)
+            self.cache.put(key, result)
+        cells, distribution = result
+        return [(r + top, c + left) for r, c in cells], distribution
+
+    def probabilities(self):
+        """返回每个单元格是地雷的概率（float64 数组），已揭示的单元格为 0。"""
+        board, solver = self.board, self.solver
+        result = np.zeros((board.rows, board.cols))
+        covered = board.state != REVEALED
+        if not board.mines_placed:  # 第一次揭示之前，所有单元格的概率相同
+            result[:] = board.num_mines / (board.rows * board.cols)
+            return result
+        if board.game_state == 'lost':  # 游戏结束后地雷的位置已知
+            result[covered & board.mines] = 1
+            return result
+
+        self.refresh()
+        components = [(cells, distribution) for _, cells, distribution in self.components.values()]
+        frontier = sum(len(cells) for cells, _ in components)
+        interior = (int(np.count_nonzero(covered)) - frontier
+                    - len(solver.mines) - len(solver.safe))  # 不与任何数字相邻的未揭示单元格数
+        mines_left = board.num_mines - len(solver.mines)  # 分量和内部单元格共同分配的地雷数
+
+        # 每个分量按地雷数的方案数分布，同一个分量内按最大值缩放，避免浮点溢出
+        weights = []
+        for _, distribution in components:
+            d = np.zeros(max(distribution) + 1)
+            for mines, (ways, _) in distribution.items():
+                d[mines] = ways
+            weights.append(d / d.max())
+
+        # R[s]：分量中共有 s 个地雷时，内部单元格放下其余地雷的方案数 C(interior, mines_left - s)（缩放后）
+        length = sum(len(d) - 1 for d in weights) + 1
+        logs = np.full(length, -np.inf)
+        for s in range(min(length, mines_left + 1)):
+            if mines_left - s <= interior:
+                logs[s] = log_binomial(interior, mines_left - s)
+        R = np.exp(logs - logs.max())
+
+        # 后向传递：T[i][x] = 第 i 个分量之后的所有分量与内部单元格一起，在前面已有 x 个地雷时的总权重
+        T = [None] * len(weights)
+        back = R
+        for i in range(len(weights) - 1, -1, -1):
+            T[i] = back
+            d = weights[i]
+            back = np.zeros(length)
+            for m in range(len(d)):
+                back[:length - m] += d[m] * T[i][m:]
+        total = back[0]  # 所有方案的总权重
+
+        # 前向传递：P 是前面各分量的地雷数分布，H 是当前分量放 m 个地雷时其余部分的总权重
+        P = np.zeros(length)
+        P[0] = 1
+        frontier_probabilities = []
+        for (cells, distribution), d, after in zip(components, weights, T):
+            scale = 1 / max(ways for ways, _ in distribution.values())
+            probability = np.zeros(len(cells))
+            for mines, (_, counts) in distribution.items():
+                H = P[:length - mines] @ after[mines:]
+                probability += np.array(counts, dtype=float) * (scale * H / total)
+            frontier_probabilities.append((cells, probability))
+            P = np.convolve(P, d)[:length]
+
+        # 内部单元格平分分量之外的地雷；先填满所有未揭示单元格，前沿和已确定的单元格随后覆盖
+        if interior:
+            outside = np.clip(mines_left - np.arange(length), 0, None)  # 分量共有 s 个地雷时内部的地雷数
+            result[covered] = (P * R * outside).sum() / total / interior
+        for cells, probability in frontier_probabilities:
+            rows, cols = zip(*cells)
+            result[rows, cols] = probability
+        for cell in solver.safe:
+            result[cell] = 0
+        for cell in solver.mines:
+            result[cell] = 1
+        return result
@@ -0,0 +1,242 @@
+#!/bin/env python
+"""
+扫雷对局录像：种子 + 带时间戳的操作流，以及无窗口全速重放和按 1x/4x/16x 渲染重放的工具。
+
+录像只记录真正改变了游戏板的点击，按实际执行的操作（揭示、插旗/切换标记、连开）存储，
+左键点击已揭示的数字记为连开；重放时用相同的种子创建游戏板、
+依次调用 engine.click，得到完全相同的对局。文件格式：
+
+    文件头：魔数、版本、行数、列数、地雷数、种子、结束时的游戏状态、结束时已揭示的安全单元格数
+    每个操作：距上一个操作的毫秒数（varint）、(单元格一维索引 << 2 | 操作类型)（varint）
+
+一个操作通常只占 3-5 字节，一局的录像只有几百字节，可以直接附在错误报告里。
+
+运行方式：
+    python replay.py game.msr                 # 无窗口全速重放，校验结果并输出耗时
+    python replay.py game.msr --repeat 1000   # 重复重放，作为可复现的性能回归负载
+    python replay.py game.msr --speed 4       # 打开窗口按 4 倍速重放
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import os  # 用于创建录像目录
+import struct  # 用于读写文件头
+import time  # 用于记录时间戳和计时
+
+import engine
+from engine import LEFT, MIDDLE, RIGHT
+
+REPLAY_MAGIC = b'MSRP'
+REPLAY_VERSION = 1
+# 文件头：魔数、版本、行数、列数、地雷数、种子、结束时的游戏状态、结束时已揭示的安全单元格数
+REPLAY_HEADER = struct.Struct('<4sBIIIQBI')
+
+# 操作类型（存储在索引的低2位）与鼠标按钮的对应关系
+BUTTONS = (LEFT, RIGHT, MIDDLE)  # 0 揭示、1 切换标记、2 连开
+ACTIONS = {button: kind for kind, button in enumerate(BUTTONS)}
+GAME_STATES = ('playing', 'won', 'lost')
+
+# 获取当前脚本的目录
+script_dir = os.path.dirname(os.path.abspath(__file__))
+REPLAY_DIR = os.path.join(script_dir, 'replays')  # main.py 保存录像的目录
+
+
+def write_varint(out, value):
+    """把非负整数按 LEB128（每字节7位，最高位表示后面还有）追加到 bytearray。"""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """从 data[pos:] 读出一个 LEB128 整数，返回 (值, 新位置)。"""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recording:
+    """一局的录像：游戏板参数、种子和 (毫秒时间戳, 行, 列, 按钮) 操作列表。"""
+
+    def __init__(self, rows, cols, num_mines, seed):
+        self.rows = rows  # 行数
+        self.cols = cols  # 列数
+        self.num_mines = num_mines  # 地雷的数量
+        self.seed = seed  # 创建游戏板的种子
+        self.actions = []  # (距开始的毫秒数, row, col, button)
+        self.game_state = 'playing'  # 录制结束时的游戏状态，用于校验重放
+        self.revealed_safe = 0  # 录制结束时已揭示的安全单元格数，用于校验重放
+
+    def create_board(self):
+        """用录像的种子创建游戏板。"""
+        return engine.create_board(self.rows, self.cols, self.num_mines, self.seed)
+
+    def dumps(self):
+        """打包成二进制。"""
+        out = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.rows, self.cols, self.num_mines,
+                                           self.seed, GAME_STATES.index(self.game_state), self.revealed_safe))
+        last = 0
+        for ms, row, col, button in self.actions:
+            write_varint(out, ms - last)  # 时间戳按差值存储，通常只占1-2字节
+            write_varint(out, (row * self.cols + col) << 2 | ACTIONS[button])
+            last = ms
+        return bytes(out)
+
+    @classmethod
+    def loads(cls, data):
+        """从 dumps 生成的二进制恢复录像。"""
+        magic, version, rows, cols, num_mines, seed, state, revealed_safe = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError('not a Minesweeper replay')
+        recording = cls(rows, cols, num_mines, seed)
+        recording.game_state = GAME_STATES[state]
+        recording.revealed_safe = revealed_safe
+        pos, ms = REPLAY_HEADER.size, 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            code, pos = read_varint(data, pos)
+            ms += delta
+            row, col = divmod(code >> 2, cols)
+            recording.actions.append((ms, row, col, BUTTONS[code & 3]))
+        return recording
+
+    def save(self, path):
+        """保存到文件。"""
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        """从文件读取。"""
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+
+class Recorder:
+    """在游戏过程中录制操作。"""
+
+    def __init__(self, board, seed):
+        self.board = board  # 录制的游戏板
+        self.recording = Recording(board.rows, board.cols, board.num_mines, seed)
+        self.start = time.monotonic()  # 开始时间
+
+    def record(self, row, col, button):
+        """记录一次改变了游戏板的点击。button 是点击前由 engine.effective_button 得到的实际操作。"""
+        ms = int((time.monotonic() - self.start) * 1000)
+        self.recording.actions.append((ms, row, col, button))
+
+    def save(self, directory=REPLAY_DIR):
+        """把录像保存到 directory，返回文件路径；没有任何操作时不保存，返回 None。"""
+        if not self.recording.actions:
+            return None
+        self.recording.game_state = self.board.game_state
+        self.recording.revealed_safe = self.board.revealed_safe
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{self.recording.seed}.msr')
+        self.recording.save(path)
+        return path
+
+
+# --- 重放 ---
+
+def replay(recording):
+    """无窗口全速重放，返回结束时的游戏板。"""
+    board = recording.create_board()
+    click = engine.click
+    for _, row, col, button in recording.actions:
+        click(board, row, col, button)
+    return board
+
+
+def verify(recording, board):
+    """检查重放的结果是否与录制时一致。"""
+    return (board.game_state == recording.game_state and
+            board.revealed_safe == recording.revealed_safe)
+
+
+def render(recording, speed, cell_size=30):
+    """打开窗口按 speed 倍速重放，只重绘变化的单元格。返回结束时的游戏板。"""
+    import pygame  # 只有渲染重放才需要 pygame
+    from atlas import TileAtlas, tile_indices, tile_index
+    from text_cache import render_text
+
+    pygame.init()
+    screen = pygame.display.set_mode((recording.cols * cell_size, recording.rows * cell_size))
+    pygame.display.set_caption(f'MineCraft Replay {speed}x')
+    atlas = TileAtlas(cell_size)
+    board = recording.create_board()
+
+    def draw(cells=None):
+        if cells is None:
+            tiles = tile_indices(board)
+            atlas.blits(screen, [(tiles[r, c], (c * cell_size, r * cell_size))
+                                 for r in range(board.rows) for c in range(board.cols)])
+            pygame.display.flip()
+        else:
+            pygame.display.update([atlas.blit(screen, tile_index(board, r, c), (c * cell_size, r * cell_size))
+                                   for r, c in cells])
+
+    def wait_until(target):
+        """等到重放时钟到达 target 秒，期间处理窗口事件；关闭窗口时返回 False。"""
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+                if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                    draw()
+            remaining = target - (time.monotonic() - start)
+            if remaining <= 0:
+                return True
+            pygame.time.wait(min(int(remaining * 1000) + 1, 50))  # 最多阻塞50毫秒，保持窗口响应
+
+    draw()
+    start = time.monotonic()
+    for ms, row, col, button in recording.actions:
+        if not wait_until(ms / 1000 / speed):
+            pygame.quit()
+            return board
+        draw(engine.click(board, row, col, button))
+
+    if board.game_state != 'playing':  # 显示结果，等待关闭窗口
+        text = render_text("You Win!" if board.game_state == 'won' else "Game Over!", 50, (255, 0, 0))
+        screen.blit(text, text.get_rect(center=screen.get_rect().center))
+        pygame.display.flip()
+    while pygame.event.wait().type != pygame.QUIT:
+        pass
+    pygame.quit()
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description='重放扫雷录像')
+    parser.add_argument('path', help='录像文件')
+    parser.add_argument('--speed', type=int, choices=(1, 4, 16), default=None,
+                        help='打开窗口按倍速重放（默认无窗口全速重放）')
+    parser.add_argument('--repeat', type=int, default=1, help='无窗口重放的次数')
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    size = os.path.getsize(args.path)
+    print(f'{recording.rows}x{recording.cols}, {recording.num_mines} mines, seed {recording.seed}, '
+          f'{len(recording.actions)} actions, {size} bytes')
+    if args.speed:
+        board = render(recording, args.speed)
+    else:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            board = replay(recording)
+        elapsed = time.perf_counter() - start
+        print(f'{elapsed / args.repeat * 1e3:.3f}ms per replay, '
+              f'{len(recording.actions) * args.repeat / elapsed:.0f} actions/s')
+    print(f'result: {board.game_state}, {board.revealed_safe} revealed '
+          f'({"matches" if verify(recording, board) else "DOES NOT MATCH"} the recording)')
+
+
+if __name__ == "__main__":
+    main()  # 调用主函数
@@ -0,0 +1,173 @@
+#!/bin/env python
+"""
+扫雷策略的批量模拟：不打开窗口，用多个进程按 engine 的规则下大量对局并汇总胜率。
+
+对局与窗口中的游戏使用同一套规则：engine.create_board 创建游戏板，engine.click 处理点击
+（main.handle_click 只是在它外面加了像素坐标换算）。策略决定每一步点击哪个单元格。
+
+对局按批分给工作进程，每批的种子由 (总种子, 批序号) 确定，结果与进程数无关，可以复现。
+
+运行方式：
+    python simulate.py --games 100000 --strategy deduction
+    python simulate.py --games 10000 --strategy probability --rows 16 --cols 30 --mines 99
+"""
+
+# 导入必要的库
+import argparse  # 用于解析命令行参数
+import itertools  # 用于取出开头的若干批
+import os  # 用于获取 CPU 数量
+import random  # 用于随机选择单元格
+import time  # 用于计算速度
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait  # 用于多进程模拟
+
+import numpy as np  # 用于选择概率最低的单元格
+
+import engine
+from engine import COVERED, LEFT
+from solver import Solver
+from probability import ProbabilityEngine
+
+BATCH_SIZE = 500  # 每个任务模拟的对局数
+
+
+# --- 策略 ---
+# 策略在每局开始时创建，update() 收到每次点击后变化的单元格，choose() 返回下一步要揭示的单元格
+
+class RandomStrategy:
+    """随机揭示一个被覆盖的单元格。"""
+
+    def __init__(self, board, rng):
+        self.board = board
+        self.rng = rng
+
+    def update(self, changed):
+        pass
+
+    def choose(self):
+        covered = np.flatnonzero(self.board.state == COVERED)
+        return divmod(int(covered[self.rng.randrange(len(covered))]), self.board.cols)
+
+
+class DeductionStrategy(RandomStrategy):
+    """揭示推导出的安全单元格，推导不出时随机猜测。"""
+
+    def __init__(self, board, rng):
+        super().__init__(board, rng)
+        self.solver = Solver(board)
+
+    def update(self, changed):
+        self.solver.update(changed)
+
+    def choose(self):
+        if self.solver.safe:
+            return next(iter(self.solver.safe))
+        return self.guess()
+
+    def guess(self):
+        """推导不出安全单元格时随机选一个不是已知地雷的被覆盖单元格。"""
+        while True:
+            cell = super().choose()
+            if cell not in self.solver.mines:
+                return cell
+
+
+class ProbabilityStrategy(DeductionStrategy):
+    """揭示推导出的安全单元格，推导不出时揭示是地雷的概率最低的单元格。"""
+
+    def __init__(self, board, rng):
+        super().__init__(board, rng)
+        self.probabilities = ProbabilityEngine(board, self.solver)
+
+    def guess(self):
+        p = self.probabilities.probabilities()
+        p[self.board.state != COVERED] = 2  # 只在被覆盖的单元格中选
+        return np.unravel_index(int(p.argmin()), p.shape)
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'deduction': DeductionStrategy,
+    'probability': ProbabilityStrategy,
+}
+
+
+# --- 模拟 ---
+
+def play(rows, cols, num_mines, strategy, seed):
+    """用给定策略下一局，返回 (是否胜利, 点击次数)。第一次点击在中央。"""
+    rng = random.Random(seed)
+    board = engine.create_board(rows, cols, num_mines, rng)
+    player = STRATEGIES[strategy](board, rng)
+    row, col = rows // 2, cols // 2
+    clicks = 0
+    while True:
+        changed = engine.click(board, row, col, LEFT)
+        clicks += 1
+        if board.game_state != 'playing':
+            return board.game_state == 'won', clicks
+        player.update(changed)
+        row, col = player.choose()
+
+
+def play_batch(rows, cols, num_mines, strategy, seed, batch, games):
+    """模拟第 batch 批的 games 局，返回 (对局数, 胜局数, 总点击次数)。在工作进程中运行。"""
+    rng = random.Random(f'{seed}-{batch}')  # 每批的种子只由总种子和批序号决定
+    wins = clicks = 0
+    for _ in range(games):
+        won, n = play(rows, cols, num_mines, strategy, rng.getrandbits(64))
+        wins += won
+        clicks += n
+    return games, wins, clicks
+
+
+def simulate(rows, cols, num_mines, strategy, games, seed=0, workers=None, batch_size=BATCH_SIZE):
+    """分批模拟 games 局，每完成一批就产出一次累计的 (对局数, 胜局数, 总点击次数)。"""
+    workers = workers or os.cpu_count() or 1
+    batches = [(i, min(batch_size, games - start)) for i, start in enumerate(range(0, games, batch_size))]
+    played = wins = clicks = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(batch, size):
+            return executor.submit(play_batch, rows, cols, num_mines, strategy, seed, batch, size)
+
+        # 每个进程保持两个任务在排队，同时避免一次提交数百万局的任务
+        queue = iter(batches)
+        pending = {submit(*batch) for batch in itertools.islice(queue, 2 * workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                n, w, c = future.result()
+                played += n
+                wins += w
+                clicks += c
+                batch = next(queue, None)
+                if batch is not None:
+                    pending.add(submit(*batch))
+            yield played, wins, clicks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量模拟扫雷策略')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='deduction', help='策略')
+    parser.add_argument('--games', type=int, default=10000, help='对局数')
+    parser.add_argument('--rows', type=int, default=9, help='行数')
+    parser.add_argument('--cols', type=int, default=9, help='列数')
+    parser.add_argument('--mines', type=int, default=10, help='地雷数')
+    parser.add_argument('--seed', type=int, default=0, help='总种子')
+    parser.add_argument('--workers', type=int, default=None, help='进程数（默认使用所有 CPU）')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='每个任务的对局数')
+    parser.add_argument('--interval', type=float, default=1.0, help='输出进度的最短间隔（秒）')
+    args = parser.parse_args()
+
+    start = last = time.perf_counter()
+    played = wins = clicks = 0
+    for played, wins, clicks in simulate(args.rows, args.cols, args.mines, args.strategy, args.games,
+                                         args.seed, args.workers, args.batch_size):
+        now = time.perf_counter()
+        if now - last >= args.interval or played == args.games:
+            last = now
+            print(f'{played:>10} games  win rate {wins / played:7.2%}  '
+                  f'{clicks / played:6.1f} clicks/game  {played / (now - start):9.0f} games/s', flush=True)
+
+
+if __name__ == "__main__":
+    main()  # 调用主函数
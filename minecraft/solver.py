@@ -0,0 +1,172 @@
+"""
+扫雷提示引擎：增量维护前沿约束，推导出必定安全和必定是地雷的单元格。
+
+每个已揭示的数字单元格给出一条约束：它周围尚未确定的单元格中恰好有若干个地雷。
+每次点击之后只用 engine.click 返回的变化单元格更新受影响的约束，不重新扫描游戏板，
+然后用两条规则传播：
+
+- 单格规则：剩余地雷数为 0 时全部安全，等于未确定单元格数时全部是地雷；
+- 子集规则：约束 A 的单元格是约束 B 的子集时，B - A 中恰好有 B.mines - A.mines 个地雷。
+
+推导不采信玩家插的旗，旗帜只影响哪些地雷还需要提示。与 engine 模块一样不依赖 pygame。
+"""
+
+from engine import REVEALED, FLAGGED, DEBUG
+
+
+class Solver:
+    """跟随一个 engine.Board 增量推导的提示引擎。"""
+
+    def __init__(self, board):
+        self.board = board  # 跟随的游戏板
+        self.constraints = {}  # 数字单元格 (row, col) -> [未确定的邻居集合, 其中剩余的地雷数]
+        self.cell_constraints = {}  # 前沿单元格 -> 包含它的约束（数字单元格）集合
+        self.safe = set()  # 已推导为安全但还没揭示的单元格
+        self.mines = set()  # 已推导为地雷的单元格
+        self.pending_mines = set()  # 已推导为地雷但还没插旗的单元格
+        self.queue = []  # 需要重新检查的约束
+        self.dirty = set()  # 新建、修改或删除过的约束，由使用者（例如 probability 模块）读取后清空
+        # 从现有局面（例如读取的存档）建立约束，之后只做增量更新
+        self.update(zip(*board.state.nonzero()))
+
+    def neighbours(self, row, col):
+        """返回 (row, col) 在游戏板内的8个邻居。"""
+        rows, cols = self.board.rows, self.board.cols
+        return [(r, c)
+                for r in range(max(row - 1, 0), min(row + 2, rows))
+                for c in range(max(col - 1, 0), min(col + 2, cols))
+                if r != row or c != col]
+
+    def update(self, changed):
+        """用一次操作中状态变化的单元格更新约束并传播推导结果。"""
+        board = self.board
+        state, mines = board.state, board.mines
+        for row, col in changed:
+            cell = (int(row), int(col))
+            s = state[cell]
+            if s == REVEALED:
+                if mines[cell]:  # 踩中地雷（连开时可能同时揭示了安全单元格），按已确定的地雷扣除
+                    if cell not in self.mines:
+                        self.mines.add(cell)
+                        self._resolve(cell, 1)
+                    self.pending_mines.discard(cell)
+                    continue
+                self.safe.discard(cell)
+                self._resolve(cell, 0)  # 已揭示的单元格从包含它的约束中移除
+                self._add_constraint(cell)
+            elif cell in self.mines:  # 插旗或取消插旗只影响待提示的地雷
+                if s == FLAGGED:
+                    self.pending_mines.discard(cell)
+                else:
+                    self.pending_mines.add(cell)
+        self._propagate()
+        if DEBUG:  # 调试模式下用真实的地雷位置校验推导结果
+            assert not any(mines[cell] for cell in self.safe), 'solver marked a mine as safe'
+            assert all(mines[cell] for cell in self.mines), 'solver marked a safe cell as a mine'
+
+    def hints(self):
+        """返回 (必定安全的单元格列表, 必定是地雷且还没插旗的单元格列表)，顺序不固定。"""
+        return list(self.safe), list(self.pending_mines)
+
+    # --- 约束维护 ---
+
+    def _add_constraint(self, cell):
+        """为新揭示的数字单元格建立约束，已推导出的单元格直接扣除。"""
+        remaining = int(self.board.adjacent[cell])
+        if remaining == 0:  # 空单元格的邻居都会被连锁揭示
+            return
+        unknown = set()
+        state = self.board.state
+        for neighbour in self.neighbours(*cell):
+            if state[neighbour] == REVEALED:
+                if self.board.mines[neighbour]:  # 连开时揭示的错误地雷也计入已知地雷
+                    remaining -= 1
+                continue
+            if neighbour in self.safe:
+                continue
+            if neighbour in self.mines:
+                remaining -= 1
+            else:
+                unknown.add(neighbour)
+        if not unknown:
+            return
+        self.constraints[cell] = [unknown, remaining]
+        self.dirty.add(cell)
+        for neighbour in unknown:
+            self.cell_constraints.setdefault(neighbour, set()).add(cell)
+        self.queue.append(cell)
+
+    def _resolve(self, cell, is_mine):
+        """把已确定的单元格从所有包含它的约束中移除，并把这些约束放回待检查队列。"""
+        for key in self.cell_constraints.pop(cell, ()):
+            self.dirty.add(key)
+            constraint = self.constraints[key]
+            constraint[0].discard(cell)
+            constraint[1] -= is_mine
+            if constraint[0]:
+                self.queue.append(key)
+            else:
+                del self.constraints[key]
+
+    def _mark_safe(self, cell):
+        if cell not in self.safe:
+            self.safe.add(cell)
+            self._resolve(cell, 0)
+
+    def _mark_mine(self, cell):
+        if cell not in self.mines:
+            self.mines.add(cell)
+            if self.board.state[cell] != FLAGGED:
+                self.pending_mines.add(cell)
+            self._resolve(cell, 1)
+
+    # --- 推导 ---
+
+    def _propagate(self):
+        """反复应用单格规则和子集规则，直到没有约束需要检查。"""
+        constraints = self.constraints
+        while self.queue:
+            key = self.queue.pop()
+            constraint = constraints.get(key)
+            if constraint is None:  # 约束已经全部确定
+                continue
+            cells, remaining = constraint
+            if remaining == 0:  # 单格规则：剩下的都安全
+                for cell in list(cells):
+                    self._mark_safe(cell)
+                continue
+            if remaining == len(cells):  # 单格规则：剩下的都是地雷
+                for cell in list(cells):
+                    self._mark_mine(cell)
+                continue
+            self._apply_subsets(key, cells)
+
+    def _apply_subsets(self, key, cells):
+        """对与约束 key 共享单元格的约束应用子集规则。"""
+        others = set()
+        for cell in cells:
+            others.update(self.cell_constraints.get(cell, ()))
+        others.discard(key)
+        for other in others:
+            # 推导会修改约束，每次都重新读取两条约束的当前内容
+            mine, constraint = self.constraints.get(key), self.constraints.get(other)
+            if mine is None:  # 本约束已经在推导中被消解
+                return
+            if constraint is None:
+                continue
+            (cells, remaining), (other_cells, other_remaining) = mine, constraint
+            if cells <= other_cells:  # 本约束是另一个约束的子集
+                self._apply_difference(other_cells - cells, other_remaining - remaining)
+            elif other_cells <= cells:  # 另一个约束是本约束的子集
+                self._apply_difference(cells - other_cells, remaining - other_remaining)
+
+    def _apply_difference(self, difference, mines):
+        """差集中恰好有 mines 个地雷：为 0 时全部安全，等于差集大小时全部是地雷。"""
+        if not difference:
+            return
+        if mines == 0:
+            for cell in difference:
+                self._mark_safe(cell)
+        elif mines == len(difference):
+            for cell in difference:
+                self._mark_mine(cell)
@@ -0,0 +1,68 @@
+"""
+字体和文字图像缓存：两个扫雷前端（main.py 和 v1/main.py）共用。
+
+创建 pygame.font.Font 需要读取并解析字体文件，render() 需要光栅化文字，
+两者都不应该每帧重复。这里按字号缓存字体对象，按 (文字, 字号, 颜色) 缓存渲染结果，
+渲染结果按最近最少使用（LRU）的顺序淘汰。
+"""
+
+# 导入必要的库
+from collections import OrderedDict  # 用于实现 LRU 淘汰顺序
+
+import pygame  # 用于创建字体和渲染文字
+
+MAX_SURFACES = 256  # 最多缓存的文字图像数量
+
+
+class TextCache:
+    """字体对象和文字图像的缓存。返回的 Surface 是共享的，调用者不要修改它。"""
+
+    def __init__(self, max_surfaces=MAX_SURFACES):
+        self.max_surfaces = max_surfaces  # 文字图像数量上限
+        self.fonts = {}  # (字体名, 字号) -> Font
+        self.surfaces = OrderedDict()  # (文字, 字号, 颜色, 抗锯齿, 字体名) -> Surface，最近使用的在末尾
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中（需要渲染）的次数
+
+    def font(self, size, name=None):
+        """返回指定字号的字体，name 为 None 时使用默认字体。"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, name=None):
+        """返回渲染好的文字图像，相同参数只渲染一次。"""
+        key = (text, size, tuple(color), antialias, name)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)  # 标记为最近使用
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:  # 淘汰最久未使用的图像
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存，例如在 pygame.quit() 之后。"""
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+# 两个前端共用的默认缓存
+default_cache = TextCache()
+
+
+def get_font(size, name=None):
+    """从默认缓存获取字体。"""
+    return default_cache.font(size, name)
+
+
+def render_text(text, size, color, antialias=True, name=None):
+    """从默认缓存获取渲染好的文字图像。"""
+    return default_cache.render(text, size, color, antialias, name)
@@ -7,6 +7,10 @@ import os # Import the os module
 from dataclasses import dataclass
 from typing import Literal
 
+# Share the font/text cache with the main front end in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_cache import render_text
+
 @dataclass
 class Cell:
     value: Literal['mine', 'empty', 'number']
@@ -87,56 +91,78 @@ def create_board():
                             num_adjacent_mines += 1
                 board[r][c].value = f'number_{num_adjacent_mines}'
 
+# Pre-rendered cell tiles, keyed by cell size
+tile_cache = {}
+
+def make_tiles(cell_size):
+    """Renders the covered, revealed and mine tiles once for the given cell size."""
+    size = (cell_size, cell_size)
+    rect = pygame.Rect(0, 0, cell_size, cell_size)
+    last = cell_size - 1
+    tiles = {}
+
+    # Covered: gray base with a bevel
+    covered = pygame.Surface(size).convert()
+    pygame.draw.rect(covered, GRAY, rect, 0)
+    # Draw highlight (top and left)
+    pygame.draw.line(covered, WHITE, (0, 0), (last, 0), 1)
+    pygame.draw.line(covered, WHITE, (0, 0), (0, last), 1)
+    # Draw shadow (bottom and right)
+    pygame.draw.line(covered, BLACK, (last, 0), (last, last), 1)
+    pygame.draw.line(covered, BLACK, (0, last), (last, last), 1)
+    tiles['covered'] = covered
+
+    # Revealed: flat background with a border
+    revealed = pygame.Surface(size).convert()
+    pygame.draw.rect(revealed, LIGHT, rect, 0)
+    pygame.draw.rect(revealed, DARK, rect, 1)
+
+    # Mine: revealed background plus the mine image
+    mine = revealed.copy()
+    mine.blit(pygame.transform.scale(mine_image, size), (0, 0))
+    tiles['mine'] = mine
+
+    # Numbers: revealed background plus the count (0 is just the flat background)
+    for num in range(9):
+        tile = revealed.copy()
+        if num > 0: # Only draw numbers greater than 0
+            text = render_text(str(num), 25, BLACK) # You might want different colors for different numbers
+            tile.blit(text, text.get_rect(center=rect.center))
+        tiles[f'number_{num}'] = tile
+    tiles['empty'] = revealed
+
+    return tiles
+
+def get_tiles(cell_size):
+    """Returns the cached tiles for the given cell size, rendering them on first use."""
+    tiles = tile_cache.get(cell_size)
+    if tiles is None:
+        tiles = tile_cache[cell_size] = make_tiles(cell_size)
+    return tiles
+
 def draw_board(screen):
     """Draws the current state of the game board."""
+    tiles = get_tiles(CELL_SIZE)
+    covered = tiles['covered']
+    blits = []
     for r in range(ROWS):
+        y = r * CELL_SIZE
         for c in range(COLS):
             cell = board[r][c]
-            x = c * CELL_SIZE
-            y = r * CELL_SIZE
-            rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-
             if cell.state == 'covered':
-                # Draw base gray
-                pygame.draw.rect(screen, GRAY, rect, 0)
-
-                # Draw highlight (top and left)
-                pygame.draw.line(screen, WHITE, (x, y), (x + CELL_SIZE - 1, y), 1)
-                pygame.draw.line(screen, WHITE, (x, y), (x, y + CELL_SIZE - 1), 1)
-                # Draw shadow (bottom and right)
-                pygame.draw.line(screen, BLACK, (x + CELL_SIZE - 1, y), (x + CELL_SIZE - 1, y + CELL_SIZE - 1), 1)
-                pygame.draw.line(screen, BLACK, (x, y + CELL_SIZE - 1), (x + CELL_SIZE - 1, y + CELL_SIZE - 1), 1)
+                blits.append((covered, (c * CELL_SIZE, y)))
             elif cell.state == 'revealed':
-                # Draw base gray
-                pygame.draw.rect(screen, LIGHT, rect, 0)
-                # Draw base cell border
-                pygame.draw.rect(screen, DARK, rect, 1)
-
-                # Draw value if revealed
-                if 'mine' in cell.value:
-                    screen.blit(mine_image, rect.topleft)
-                elif 'number' in cell.value:
-                    num = int(cell.value.split('_')[1])
-                    if num > 0: # Only draw numbers greater than 0
-                        font = pygame.font.Font(None, 25)
-                        text = font.render(str(num), True, BLACK) # You might want different colors for different numbers
-                        text_rect = text.get_rect(center=rect.center)
-                        screen.blit(text, text_rect)
-                # If 'empty' and revealed, just draw the flat background
-                elif 'empty' in cell.value:
-                    # TODO: play a sound for good luck
-                    pass
-                else:
-                    assert False
-            
-            # Draw cell border (optional, depends on desired look)
-            # pygame.draw.rect(screen, BLACK, rect, 1)
+                # Revealed values are 'mine', 'number_N' or 'empty'
+                blits.append((tiles[cell.value], (c * CELL_SIZE, y)))
 
             # TODO: Add drawing logic for flagged cells based on cell.state
             # if cell.state == 'flagged':
             #     # Draw flag icon
             #     pass
 
+    # Draw the whole board in one batch
+    screen.blits(blits, doreturn=False)
+
 def handle_click(x, y, button):
     # Convert pixel coordinates to board coordinates
     col = x // CELL_SIZE
@@ -221,10 +247,9 @@ def main():
         
         # Display game state message
         if game_state != 'playing':
-            font = pygame.font.Font(None, 50)
             message = "You Win!" if game_state == 'won' else "Game Over!"
             color = GREEN if game_state == 'won' else RED
-            text = font.render(message, True, color)
+            text = render_text(message, 50, color)
             text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
             screen.blit(text, text_rect)
 